@@ -0,0 +1,41 @@
+import os
+import pygame
+
+
+class Assets(object):
+    # every image in the directory, loaded once and packed into one atlas surface
+    def __init__(self, directory='images', columns=8):
+        self.directory = directory
+        self.columns = columns
+        self.rects = {}
+        self.__atlas = None
+        self.__images = {}
+
+    @property
+    def atlas(self):
+        if self.__atlas is None:
+            self.load()
+        return self.__atlas
+
+    def load(self):
+        images = []
+        for file_name in sorted(os.listdir(self.directory)):
+            name, ext = os.path.splitext(file_name)
+            if ext == '.png':
+                images.append((name, pygame.image.load(os.path.join(self.directory, file_name)).convert_alpha()))
+        cell_w = max(image.get_width() for name, image in images)
+        cell_h = max(image.get_height() for name, image in images)
+        rows = (len(images) + self.columns - 1)//self.columns
+        self.__atlas = pygame.Surface((self.columns*cell_w, rows*cell_h), pygame.SRCALPHA).convert_alpha()
+        for i, (name, image) in enumerate(images):
+            rect = image.get_rect(topleft=((i % self.columns)*cell_w, (i//self.columns)*cell_h))
+            # max against the cleared atlas copies the pixels as they are instead of blending them
+            self.__atlas.blit(image, rect, special_flags=pygame.BLEND_RGBA_MAX)
+            self.rects[name] = rect
+
+    def get(self, name):
+        # takes a bare name like 'house0' or a path like 'images/house0.png'
+        name = os.path.splitext(os.path.basename(name))[0]
+        if name not in self.__images:
+            self.__images[name] = self.atlas.subsurface(self.rects[name])
+        return self.__images[name]
@@ -1,13 +1,14 @@
 import os.path
 import pygame
-import random
 import math
 import pickle
-import tilemaps
-from collections import defaultdict
+import time
+from assets import Assets
+from textcache import TextCache
 from statusbar import StatusBar
 from statussquare import StatusSquare
 from scrollwindow import ScrollWindow
+from sim import World, Scheduler, Timer, ItemHistory, get_name
 from constants import *
 
 pygame.init()
@@ -17,9 +18,8 @@ clock = pygame.time.Clock()
 
 gameDisplay = pygame.display.set_mode((DISPLAY_WIDTH, DISPLAY_HEIGHT))
 
-for res in RESOURCES:
-    if 'image_str' in RESOURCES[res]:
-        RESOURCES[res]['image'] = pygame.image.load(RESOURCES[res]['image_str']).convert_alpha()
+assets = Assets()
+texts = TextCache()
 
 gameArea = gameDisplay.subsurface(GAME_AREA_RECT)
 maprect = (MAP_OFFSET[0], MAP_OFFSET[1], (MAP_SIZE*TILE_WIDTH), (MAP_SIZE*TILE_HEIGHT))
@@ -34,10 +34,12 @@ for x in range(3):
     for y in range(3):
         pygame.draw.rect(mapviewbutton, BLACK, (x*15, y*15, 10, 10))
 
-rand_row = [0, 1, 2, 3, 4, 5, 6, 7, 8]
-rand_col = [0, 1, 2, 3, 4, 5, 6, 7, 8]
-random.shuffle(rand_row)
-random.shuffle(rand_col)
+# screen regions redrawn separately by Game.drawgame, inside the 1px display border
+TOP_RECT = pygame.Rect(1, 1, GAME_OFFSET[0]+GAME_WIDTH+8, GAME_OFFSET[1]-1)
+GAME_RECT = pygame.Rect(GAME_AREA_RECT)
+POP_RECT = pygame.Rect(1, GAME_OFFSET[1]+GAME_HEIGHT, TOP_RECT.w, DISPLAY_HEIGHT-GAME_OFFSET[1]-GAME_HEIGHT-1)
+SIDE_RECT = pygame.Rect(TOP_RECT.right, 1, DISPLAY_WIDTH-TOP_RECT.right-1, GAME_OFFSET[1]+502)
+LOG_RECT = pygame.Rect(SIDE_RECT.x, SIDE_RECT.bottom, SIDE_RECT.w, DISPLAY_HEIGHT-SIDE_RECT.bottom-1)
 
 perk_grid_y = -1
 last_j = 0
@@ -55,13 +57,14 @@ game = None
 
 
 def text_objects(text, font, color=BLACK, bg=None):
-    text_surface = font.render(text, True, color, bg)
+    text_surface = texts.render(font, text, color, bg)
     return text_surface, text_surface.get_rect()
 
 
 class Log(object):
     def __init__(self):
         self.text_lines = []
+        self.version = 0
         self.__surf = None
 
     @property
@@ -74,6 +77,7 @@ class Log(object):
         self.text_lines.append(textline)
         if len(self.text_lines) > 5:
             del self.text_lines[0]
+        self.version += 1
         self.make_surf()
 
     def make_surf(self):
@@ -88,141 +92,7 @@ class Log(object):
 log = Log()
 
 
-class Player(object):
-    def __init__(self):
-        self.max_energy = 100
-        self.inventory = {'energy': 0,
-                          'coins': 0,
-                          'wood': 0,
-                          'stick': 0,
-                          'sand': 0,
-                          'stone': 0,
-                          'food': 0,
-                          'ironore': 0,
-                          'iron': 0,
-                          'glass': 0,
-                          'goldore': 0,
-                          'gold': 0,
-                          'gem': 0}
-        self.population = 0
-        self.known_items = []
-        self.recipes = {}
-        self.free_crafting = False
-        self.buildables = {}
-        self.free_building = False
-        self.perks = []
-        self.usables = {'food': {'gives': {'energy': 20},
-                                 'costs': {'food': 1}}}
-        self.rates = {}
-        # dropbuffs = {'res': {'gives':{'thing': 0}...,'minecosts': {'thing': 0}}...}
-        self.dropbuffs = {}
-        for key1 in RESOURCES:
-            self.dropbuffs[key1] = {'minegives': {}, 'minecosts': {}}
-            for key2 in RESOURCES[key1]['minegives']:
-                self.dropbuffs[key1]['minegives'][key2] = 0
-            for key2 in RESOURCES[key1]['minecosts']:
-                self.dropbuffs[key1]['minecosts'][key2] = 0
-
-    def get_perk(self, perk_id):
-        global pages
-        perk = PERKS[perk_id]
-        if 'knowledge' in perk:
-            if 'recipes' in perk['knowledge']:
-                for recipe in perk['knowledge']['recipes']:
-                    self.learn_recipe(recipe)
-            if 'buildings' in perk['knowledge']:
-                for building in perk['knowledge']['buildings']:
-                    self.learn_building(building)
-        if 'bonuses' in perk:
-            mine_gives = perk['bonuses'].get('minegives', None)
-            mine_time = perk['bonuses'].get('minetime', None)
-            if mine_gives is not None:
-                for bonus in mine_gives:
-                    for thing in mine_gives[bonus]:
-                        self.dropbuffs[bonus]['minegives'][thing] += mine_gives[bonus][thing]
-
-            if mine_time is not None:
-                for bonus in mine_time:
-                    if bonus not in self.rates:
-                        self.rates[bonus] = mine_time[bonus]
-                    else:
-                        self.rates[bonus] = self.rates[bonus]*mine_time[bonus]
-            if 'free crafting' in perk['bonuses']:
-                self.free_crafting = True
-            if 'free building' in perk['bonuses']:
-                self.free_building = True
-            if 'buying' in perk['bonuses']:
-                pages = ['Inventory', 'Use', 'Buy', 'Craft', 'Build', 'Perks']
-                do_page_select_surfs()
-
-    def buffedgives(self, res):
-        gives = {}
-        for key, value in RESOURCES[res]['minegives'].items():
-            gives[key] = int(value*(1+self.dropbuffs[res]['minegives'][key]))
-        return gives
-
-    def learn_recipe(self, thing):
-        self.recipes[thing] = ALL_RECIPES[thing]
-
-    def learn_building(self, thing):
-        self.buildables[thing] = BUILDABLES[thing]
-
-    def adjust_inventory(self, item, amt):
-        if item == 'energy':
-            new_amt = min(self.max_energy, self.inventory['energy'] + amt)
-            self.inventory['energy'] = new_amt
-        else:
-            if item not in self.known_items:
-                self.known_items.append(item)
-            self.inventory[item] += amt
-            if self.inventory[item] < 0:
-                self.inventory[item] = 0
-                return 'failed'
-
-    def craftable(self, item, number=1):
-        is_craftable = True
-        for key, value in self.recipes[item]['costs'].items():
-            if self.inventory[key] < value*number:
-                if key != 'energy' or self.free_crafting is False:
-                    is_craftable = False
-        return is_craftable
-
-    def buildable(self, item):
-        is_buildable = True
-        for key, value in self.buildables[item]['buildcosts'].items():
-            if self.inventory[key] < value:
-                if key != 'energy' or self.free_building is False:
-                    is_buildable = False
-        return is_buildable
-
-    def usable(self, item, number=1):
-        is_usable = True
-        for key, value in self.usables[item]['costs'].items():
-            if self.inventory[key] < value*number:
-                is_usable = False
-        return is_usable
-
-    def craft(self, item, number=1):
-        if self.craftable(item, number):
-            for key, value in self.recipes[item]['costs'].items():
-                if key != 'energy' or self.free_crafting is False:
-                    self.adjust_inventory(key, -value*number)
-            for key, value in self.recipes[item]['gives'].items():
-                self.adjust_inventory(key, value*number)
-                text = '{:,}'.format(value*number)+' '+get_name(key, value*number, False)+' crafted'
-                log.add_line(TextLine(text))
-
-    def use(self, item, number=1):
-        if self.usable(item, number):
-            for key, value in self.usables[item]['costs'].items():
-                self.adjust_inventory(key, -value*number)
-            for key, value in self.usables[item]['gives'].items():
-                self.adjust_inventory(key, value*number)
-                text = '{:,}'.format(number)+' '+get_name(item, number, False)+' used'
-                log.add_line(TextLine(text))
-
-
-player = Player()
+player = None
 
 
 class TextLine(object):
@@ -277,528 +147,134 @@ class ToolTip(pygame.Surface):
 
     def draw(self, surface, pos):
         new_pos = (min(pos[0]+10, surface.get_width()-self.w-1), max(1, pos[1]-self.h-10))
-        surface.blit(self, new_pos)
+        return surface.blit(self, new_pos)
 
 
-class Tile(object):
-    def __init__(self, x, y, owner_map, tile_type='g'):
-        self.grid_x = x
-        self.grid_y = y
-        self.map: Map = owner_map
-        self.type = tile_type
-        self.color = TILE_INFO[tile_type]['color']
-        self.__surf = None
-        self.__rect = None
-        self.resource = None
-        self.__resource_dict = None
-        self.mine_costs = None
-        self.beds = 0
-        self.population = 0
-        self.max_power = 0
-        self.recruit_cost = 0
-        self.produces = None
-        self.gathers = None
-        self.frequency = None
-        self.upkeep = None
-        self.work_radius = None
-        self.symbol = None
-        self.__image = None
-        self.status = None
-        self.status_square = None
-        self.timer = None
-        self.__tooltip = None
+def get_grid_pos(map_mouse):
+    xgrid = int(map_mouse[0]//TILE_WIDTH)
+    ygrid = int(map_mouse[1]//TILE_HEIGHT)
+    if 0 <= xgrid < MAP_SIZE and 0 <= ygrid < MAP_SIZE:
+        return xgrid, ygrid
+    return None
 
-    @property
-    def rect(self):
-        if self.__rect is None:
-            self.__rect = pygame.Rect(self.grid_x*TILE_WIDTH, self.grid_y*TILE_HEIGHT, TILE_WIDTH, TILE_HEIGHT)
-        return self.__rect
 
-    @property
-    def surf(self):
-        if self.__surf is None:
-            self.redraw()
-        return self.__surf
+def get_tile_rect(tile):
+    return pygame.Rect(tile.grid_x*TILE_WIDTH, tile.grid_y*TILE_HEIGHT, TILE_WIDTH, TILE_HEIGHT)
 
-    @property
-    def resource_dict(self):
-        if self.__resource_dict is None:
-            self.__resource_dict = RESOURCES[self.resource]
-        return self.__resource_dict
 
-    @property
-    def image(self):
-        if self.__image is None:
-            self.__image = RESOURCES[self.resource]['image']
-        return self.__image
-
-    def tick(self):
-        if self.timer:
-            num = 100-100*self.timer.value/float(self.timer.ticks)
-            if self.status == 'mined':
-                self.status_square.set(num)
-            elif self.status == 'building':
-                self.status_square.set(100-num)
-            self.timer.tick()
-            if self.timer and self.timer.value <= 0:
-                self.status = None
-                self.status_square = None
-                self.timer = None
-            self.redraw()
-
-    def spawn(self, force=False):
-        if len(TILE_INFO[self.type]['can_spawn'].items()) > 0 or force:
-            res_list = []
-            for key, value in TILE_INFO[self.type]['can_spawn'].items():
-                for i in range(value):
-                    res_list.append(key)
-            res = random.choice(res_list)
-            if res != 'none':
-                self.resource = res
-                self.__resource_dict = RESOURCES[res]
-                self.mine_costs = self.resource_dict['minecosts']
-                if 'symbol' in self.resource_dict:
-                    self.symbol = self.resource_dict['symbol']
-                else:
-                    self.__image = self.resource_dict['image']
-                self.redraw()
-                self.set_tooltip()
-
-    def begin_build(self, res):
-        self.resource = res
-        self.__resource_dict = RESOURCES[res]
-        self.mine_costs = self.resource_dict['minecosts']
-        self.produces = self.resource_dict.get('produces', None)
-        self.gathers = self.resource_dict.get('gathers', None)
-        self.frequency = self.resource_dict.get('frequency', None)
-        self.upkeep = self.resource_dict.get('upkeep', None)
-        self.work_radius = self.resource_dict.get('workradius', None)
-        if 'symbol' in self.resource_dict:
-            self.symbol = self.resource_dict['symbol']
-        else:
-            self.__image = self.resource_dict['image']
-        for key, value in BUILDABLES[res]['buildcosts'].items():
-            if key != 'energy' or player.free_building is False:
-                player.adjust_inventory(key, -value)
-        action = self.finish_build
-        action_dict = {}
-        self.timer = Timer(BUILDABLES[res]['buildtime'], action, action_dict)
-        self.status = 'building'
-        self.status_square = StatusSquare(self.rect.w, self.rect.h, WHITE)
-        self.redraw()
-
-    def finish_build(self):
-        beds = self.resource_dict.get('beds', 0)
-        self.map.beds += beds
-        self.beds += beds
-        if 'powerproduced' in self.resource_dict:
-            self.max_power = self.resource_dict['powerproduced']
-            self.map.max_power += self.max_power
-
-        self.recruit_cost = self.resource_dict.get('recruitcost', 0)
-        if self.produces or self.gathers or self.upkeep:
-            action = self.begin_work
-            action_dict = {}
-            self.timer = Timer(ONE_SEC, action, action_dict)
-            self.status = 'starting production'
-        else:
-            self.status = None
-        self.status_square = None
-        self.redraw()
-        self.set_tooltip()
-
-    def begin_work(self):
-        if self.upkeep is None or self.can_work():
-            if self.status in ['not producing', 'disabled', 'starting production']:
-                if self.population > 0:
-                    self.map.available_workers += self.population
-                if self.max_power > 0:
-                    self.map.available_power += self.max_power
-
-            if self.upkeep:
-                for key, value in self.upkeep.items():
-                    if key == 'workers':
-                        self.map.available_workers -= value
-                    elif key == 'power':
-                        self.map.available_power -= value
-                    else:
-                        player.adjust_inventory(key, -value)
-            action = self.finish_work
-            action_dict = {}
-            self.timer = Timer(self.frequency, action, action_dict)
-            self.status = 'producing'
-        else:
-            if self.status == 'producing':
-                self.map.available_workers -= self.population
-                self.map.available_power -= self.max_power
-            action = self.begin_work
-            action_dict = {}
-            self.timer = Timer(self.frequency, action, action_dict)
-            self.status = 'not producing'
-        self.redraw()
-        self.set_tooltip()
-
-    def finish_work(self):
-        if self.upkeep:
-            if 'workers' in self.upkeep:
-                self.map.available_workers += self.upkeep['workers']
-            if 'power' in self.upkeep:
-                self.map.available_power += self.upkeep['power']
-        if self.upkeep is None or self.can_work():
-            self.status = 'producing'
-            if self.produces:
-                for key, value in self.produces.items():
-                    player.adjust_inventory(key, value)
-
-            worked = False
-            if self.gathers:
-                for y in range(self.work_radius*2+1):
-                    for x in range(self.work_radius*2+1):
-                        grid_y = self.grid_y + y - self.work_radius
-                        grid_x = self.grid_x + x - self.work_radius
-                        if 8 >= grid_y >= 0 and 8 >= grid_x >= 0:
-                            if ((self.map.tiles[grid_y][grid_x].resource in self.gathers
-                                 and self.map.tiles[grid_y][grid_x].status != 'mined')):
-                                worked = self.map.tiles[grid_y][grid_x].resource
-                                self.map.tiles[grid_y][grid_x].begin_mine(manual=False)
-                                break
-                    if worked:
-                        break
-
-            if self.upkeep:
-                for key, value in self.upkeep.items():
-                    if key == 'workers':
-                        self.map.available_workers -= self.upkeep['workers']
-                    elif key == 'power':
-                        self.map.available_power -= self.upkeep['power']
-                    else:
-                        player.adjust_inventory(key, -value)
-            ticks = self.frequency
-            if worked:
-                if worked in player.rates:
-                    rate = player.rates[worked]
-                else:
-                    rate = 1
-                ticks = int(RESOURCES[worked]['minetime']*rate)
-            action = self.finish_work
-            action_dict = {}
-            self.timer = Timer(ticks, action, action_dict)
-        else:
-            if self.status == 'producing':
-                self.map.available_workers -= self.population
-                self.map.available_power -= self.max_power
-            action = self.begin_work
-            action_dict = {}
-            self.timer = Timer(self.frequency, action, action_dict)
-            self.status = 'not producing'
-        self.redraw()
-        self.set_tooltip()
-
-    def can_work(self):
-        will_work = True
-        if self.upkeep:
-            for key, value in self.upkeep.items():
-                if key == 'workers':
-                    if self.map.available_workers < value:
-                        will_work = False
-                elif key == 'power':
-                    if self.map.available_power < value:
-                        will_work = False
-                else:
-                    if player.inventory[key] < value:
-                        will_work = False
-        return will_work
-
-    def minable(self):
-        is_minable = True
-        if self.mine_costs:
-            for key, value in self.mine_costs.items():
-                if player.inventory[key] < value:
-                    is_minable = False
-        return is_minable
-
-    def begin_mine(self, manual=True):
-        if self.beds > 0:
-            self.map.beds -= self.beds
-            self.beds = 0
-            self.recruit_cost = 0
-        if self.status == 'producing':
-            if self.upkeep:
-                self.map.available_workers += self.upkeep.get('workers', 0)
-                self.map.available_power += self.upkeep.get('power', 0)
-            self.map.available_workers -= self.population
-            if self.max_power > 0:
-                self.map.max_power -= self.max_power
-                self.map.available_power -= self.max_power
-                self.max_power = 0
-
-        if self.population > 0:
-            self.map.population -= self.population
-            self.population = 0
-        if not manual or self.minable():
-            self.status = 'mined'
-            if manual:
-                for key, value in self.mine_costs.items():
-                    player.adjust_inventory(key, -value)
-            action = self.finish_mine
-            action_dict = {}
-            if self.resource in player.rates:
-                rate = player.rates[self.resource]
-            else:
-                rate = 1
-            ticks = int(RESOURCES[self.resource]['minetime']*rate)
-            self.timer = Timer(ticks, action, action_dict)
-            self.status_square = StatusSquare(self.rect.w, self.rect.h, WHITE)
-            self.redraw()
-
-    def finish_mine(self):
-        for key, value in player.buffedgives(self.resource).items():
-            player.adjust_inventory(key, value)
-            text = '{:,}'.format(value)+' '+get_name(key, value, False)+' added'
-            log.add_line(TextLine(text))
-        self.resource = None
-        self.__resource_dict = None
-        self.mine_costs = None
-        self.produces = None
-        self.gathers = None
-        self.frequency = None
-        self.upkeep = None
-        self.work_radius = None
-        self.symbol = None
-        self.__image = None
-        self.status = None
-        self.status_square = None
-        self.timer = None
-        self.redraw()
-        self.set_tooltip()
-
-    def disable(self):
-        if self.status == 'producing':
-            if self.upkeep:
-                self.map.available_workers += self.upkeep.get('workers', 0)
-                self.map.available_power += self.upkeep.get('power', 0)
-            self.map.available_workers -= self.population
-            self.map.available_power -= self.max_power
-
-        self.status = 'disabled'
-        self.status_square = None
-        self.timer = None
-        self.redraw()
-        self.set_tooltip()
-
-    def enable(self):
-        action = self.begin_work
-        action_dict = {}
-        self.timer = Timer(self.frequency, action, action_dict)
-        self.status = 'not producing'
-        self.redraw()
-        self.set_tooltip()
+# tiles that look the same share one composed surface; only the progress overlay is per tile
+tile_sprites = {}
 
-    @property
-    def tooltip(self):
-        if self.__tooltip is None:
-            self.set_tooltip()
-        return self.__tooltip
 
-    def set_tooltip(self):
-        text_list = [TextLine(TILE_INFO[self.type]['name'] + ' tile')]
-        if self.resource is not None:
-            text_list.append(TextLine(''))
-            text_list.append(TextLine('Has ' + ITEMS[self.resource]['lower']))
-            text_list.append(TextLine(''))
-            text_list.append(TextLine('Gives:'))
-            for key, value in player.buffedgives(self.resource).items():
-                text = '  ' + ITEMS[key]['i_cap'] + ' (' + '{:,}'.format(value) + ')'
-                text_list.append(TextLine(text))
-            if self.mine_costs is not None:
-                text_list.append(TextLine(''))
-                text_list.append(TextLine('Costs (to mine):'))
-                for key, value in self.mine_costs.items():
-                    text = ('  '+'{:,}'.format(value)+' '+ITEMS[key]['lower']+
-                            ' ('+'{:,}'.format(player.inventory[key])+')')
-                    if self.mine_costs[key] <= player.inventory[key]:
-                        text_list.append(TextLine(text))
-                    else:
-                        text_list.append(TextLine(text, GREY))
-            if self.timer is not None:
-                text_list.append(TextLine(''))
-                text_list.append(TextLine('Done in:'))
-                time_str = str(int(self.timer.value/ONE_SEC))
-                text = '  '+time_str+' seconds'
-                text_list.append(TextLine(text))
-        if self.status is not None:
-            text_list.append(TextLine(''))
-            text_list.append(TextLine('status: '+self.status))
-        self.__tooltip = ToolTip(text_list, BLACK)
+def get_sprite_key(tile):
+    population = tile.population if tile.beds > 0 else None
+    return tile.type, tile.resource, tile.status == 'disabled', population
 
-    def doclick(self, event):
-        if event.button == 1:
-            if self.mine_costs:
-                for key, value in self.mine_costs.items():
-                    if key == 'energy' and player.inventory[key] < value:
-                        if game.energy_bar_flash:
-                            game.energy_bar_flash = False
-                        else:
-                            game.energy_bar_flash = True
-                            game.timers.append(Timer(5, game.unflash_energy_bar, {}))
-            if self.resource and self.status not in ['mined', 'building'] and self.minable():
-                if RESOURCES[self.resource].get('confirmdestroy', False):
-                    if do_confirm_popup(['Are you sure you want', 'to destroy this '+self.resource+'?']):
-                        self.begin_mine()
-                else:
-                    self.begin_mine()
-        elif event.button == 3:
-            if self.resource and self.resource in BUILDABLES and self.status not in ['building', 'mined']:
-                menu_items = []
-                can_recruit = False
-                can_destroy = False
-                if self.resource == 'house':
-                    if (self.beds > self.population
-                        and RESOURCES[self.resource].get('recruitcost', 0) <= player.inventory['coins']):
-                        color1 = BLACK
-                        can_recruit = True
-                    else:
-                        color1 = GREY
-                    menu_items.append(TextLine('Recruit worker ('+str(self.recruit_cost)+' Coins)',
-                                               color1, return_val='recruit'))
-                if self.minable():
-                    color2 = BLACK
-                    can_destroy = True
-                else:
-                    color2 = GREY
-                menu_items.append(TextLine('Destroy ', color2, return_val='destroy'))
-                if self.frequency:
-                    if self.status != 'disabled':
-                        menu_items.append(TextLine('Disable ', return_val='disable'))
-                    else:
-                        menu_items.append(TextLine('Enable ', return_val='enable'))
-                # Make all choice rects extend to end of menu so you don't have to click the text
-                max_width = max(item.rect.w for item in menu_items)
-                for item in menu_items:
-                    item.rect.w = max_width
-                selection = None
-                menuw = 0
-                menuh = 0
-                for item in menu_items:
-                    item.rect.topleft = (1, menuh)
-                    menuw = max(menuw, item.rect.w + 2)  # pixel buffer of 1 on each side
-                    menuh += item.rect.h
-                greyout = pygame.Surface((DISPLAY_WIDTH, DISPLAY_HEIGHT))
-                greyout.fill(WHITE)
-                greyout.set_alpha(150)
-                gameDisplay.blit(greyout, (0, 0))
-                mouse = pygame.mouse.get_pos()
-                game_mouse = get_rel_mouse(mouse, gameDisplay)
-                menu = gameDisplay.subsurface((game_mouse[0], game_mouse[1], menuw, menuh))
-                menu.fill(WHITE)
-                pygame.draw.rect(menu, BLACK, menu.get_rect(), 1)
-                for item in menu_items:
-                    menu.blit(item.surf, item.rect)
-                pygame.display.flip()
-                in_menu = True
-                while in_menu:
-                    mouse = pygame.mouse.get_pos()
-                    menu_mouse = get_rel_mouse(mouse, menu)
-                    for event in pygame.event.get():
-                        if event.type == pygame.QUIT:
-                            pygame.quit()
-                            quit()
-                        if event.type == pygame.MOUSEBUTTONUP:
-                            for item in menu_items:
-                                if item.rect.collidepoint(menu_mouse):
-                                    selection = item.return_val
-                            in_menu = False
-                if selection == 'recruit' and can_recruit:
-                    self.map.population += 1
-                    if self.status == 'producing':
-                        self.map.available_workers += 1
-                    self.population += 1
-                    player.adjust_inventory('coins', -RESOURCES[self.resource].get('recruitcost', 0))
-                elif selection == 'destroy' and can_destroy:
-                    if self.resource and self.status not in ['mined', 'building'] and self.minable():
-                        if RESOURCES[self.resource].get('confirmdestroy', False):
-                            if do_confirm_popup(
-                                    ['Are you sure you want', 'to destroy this ' + self.resource + '?']):
-                                self.begin_mine()
-                        else:
-                            self.begin_mine()
-                elif selection == 'enable':
-                    self.enable()
-                elif selection == 'disable':
-                    self.disable()
-            elif not self.resource:
-                self.spawn(force=True)
-            self.redraw()
-            self.set_tooltip()
 
-    def check_mouseover(self, mouse):
-        if ((self.rect.x + self.rect.w > mouse[0] > self.rect.x
-             and self.rect.y + self.rect.h > mouse[1] > self.rect.y)):
-            return True
+def get_tile_sprite(tile):
+    key = get_sprite_key(tile)
+    if key not in tile_sprites:
+        tile_sprites[key] = make_tile_sprite(*key)
+    return tile_sprites[key]
 
-    def get_rect(self):
-        return [self.rect.x, self.rect.y, self.rect.w, self.rect.h]
 
-    def redraw(self):
-        self.__surf = pygame.Surface((TILE_WIDTH, TILE_HEIGHT))
-        bg_color = self.color
-        if self.status == 'disabled':
-            bg_color = RED
-        pygame.draw.rect(self.__surf, bg_color, (self.__surf.get_rect()))
-        if self.resource:
-            if self.symbol:
-                text_surf, text_rect = text_objects(self.symbol, FONTS['45'])
-                text_rect.center = self.__surf.get_rect().center
-                self.__surf.blit(text_surf, text_rect)
-            elif self.image:
-                if self.beds > 0:
-                    if self.population == 0:
-                        self.__surf.blit(pygame.image.load('images/house0.png').convert_alpha(), (0, 0))
-                    elif self.population == 1:
-                        self.__surf.blit(pygame.image.load('images/house1.png').convert_alpha(), (0, 0))
-                    elif self.population == 2:
-                        self.__surf.blit(pygame.image.load('images/house2.png').convert_alpha(), (0, 0))
-                    elif self.population == 3:
-                        self.__surf.blit(pygame.image.load('images/house3.png').convert_alpha(), (0, 0))
-                    elif self.population == 4:
-                        self.__surf.blit(pygame.image.load('images/house4.png').convert_alpha(), (0, 0))
+# where each tile lands in an island's thumbnail, the cells taking up the rounding
+THUMB_CELLS = {}
+for y in range(MAP_SIZE):
+    for x in range(MAP_SIZE):
+        left, top = (x*TILE_WIDTH)//MAP_SIZE, (y*TILE_HEIGHT)//MAP_SIZE
+        THUMB_CELLS[(x, y)] = pygame.Rect(left, top, ((x+1)*TILE_WIDTH)//MAP_SIZE - left,
+                                          ((y+1)*TILE_HEIGHT)//MAP_SIZE - top)
+thumb_cells = {}
+
+
+def get_thumb_cell(tile, tile_surf):
+    size = THUMB_CELLS[(tile.grid_x, tile.grid_y)].size
+    if tile.progress is not None:
+        return pygame.transform.smoothscale(tile_surf, size)
+    key = (get_sprite_key(tile), size)
+    if key not in thumb_cells:
+        thumb_cells[key] = pygame.transform.smoothscale(tile_surf, size)
+    return thumb_cells[key]
+
+
+def make_tile_sprite(tile_type, resource, disabled, population):
+    surf = pygame.Surface((TILE_WIDTH, TILE_HEIGHT))
+    bg_color = TILE_INFO[tile_type]['color']
+    if disabled:
+        bg_color = RED
+    pygame.draw.rect(surf, bg_color, (surf.get_rect()))
+    if resource:
+        resource_dict = RESOURCES[resource]
+        if 'symbol' in resource_dict:
+            text_surf, text_rect = text_objects(resource_dict['symbol'], FONTS['45'])
+            text_rect.center = surf.get_rect().center
+            surf.blit(text_surf, text_rect)
+        elif population is not None:
+            surf.blit(assets.get('house{}'.format(population)), (0, 0))
+        else:
+            surf.blit(assets.get(resource_dict['image_str']), (0, 0))
+    pygame.draw.rect(surf, BLACK, surf.get_rect(), 1)
+    return surf
+
+
+def draw_tile(surf, tile, rect, status_square):
+    # straight into the target, the shared sprite first and the shared progress frame over it
+    surf.blit(get_tile_sprite(tile), rect)
+    progress = tile.progress
+    if progress is not None:
+        status_square.set(progress)
+        surf.blit(status_square.surf, rect)
+        pygame.draw.rect(surf, BLACK, rect, 1)
+
+
+def make_tile_tooltip(tile):
+    text_list = [TextLine(TILE_INFO[tile.type]['name'] + ' tile')]
+    if tile.resource is not None:
+        text_list.append(TextLine(''))
+        text_list.append(TextLine('Has ' + ITEMS[tile.resource]['lower']))
+        text_list.append(TextLine(''))
+        text_list.append(TextLine('Gives:'))
+        for key, value in player.buffedgives(tile.resource).items():
+            text = '  ' + ITEMS[key]['i_cap'] + ' (' + '{:,}'.format(value) + ')'
+            text_list.append(TextLine(text))
+        if tile.mine_costs is not None:
+            text_list.append(TextLine(''))
+            text_list.append(TextLine('Costs (to mine):'))
+            for key, value in tile.mine_costs.items():
+                text = ('  '+'{:,}'.format(value)+' '+ITEMS[key]['lower']+
+                        ' ('+'{:,}'.format(player.inventory[key])+')')
+                if tile.mine_costs[key] <= player.inventory[key]:
+                    text_list.append(TextLine(text))
                 else:
-                    self.__surf.blit(self.image, (0, 0))
-        if self.status_square is not None:
-            self.__surf.blit(self.status_square.surf, self.__surf.get_rect())
-        pygame.draw.rect(self.__surf, BLACK, self.__surf.get_rect(), 1)
+                    text_list.append(TextLine(text, GREY))
+        if tile.timer is not None:
+            text_list.append(TextLine(''))
+            text_list.append(TextLine('Done in:'))
+            time_str = str(int(tile.timer.value/ONE_SEC))
+            text = '  '+time_str+' seconds'
+            text_list.append(TextLine(text))
+    if tile.status is not None:
+        text_list.append(TextLine(''))
+        text_list.append(TextLine('status: '+tile.status))
+    return ToolTip(text_list, BLACK)
 
-    def draw(self, surface):
-        surface.blit(self.surf, self.get_rect())
 
-    def clean(self):
-        self.__surf = None
-        self.__rect = None
-        self.__resource_dict = None
-        self.__image = None
-        self.__tooltip = None
-        if self.status_square:
-            self.status_square.clean()
-
-
-class Map(object):
-    def __init__(self, tilemap):
-        self.tiles = [[None]*MAP_SIZE for _ in range(MAP_SIZE)]
-        self.res_count = 0
-        self.beds = 0
-        self.population = 0
-        self.available_workers = 0
-        self.max_power = 0
-        self.available_power = 0
-        for y, row in enumerate(tilemap):
-            for x, col in enumerate(row):
-                if col != '0':
-                    self.tiles[y][x] = Tile(x, y, self, col)
-        for i in range(10):
-            self.rand_spawn()
+class IslandView(object):
+    def __init__(self, tile_map):
+        self.map = tile_map
+        # progress last drawn for each tile that has an overlay
+        self.shown_progress = {}
+        self.status_square = StatusSquare(TILE_WIDTH, TILE_HEIGHT, WHITE)
         self.__surf = None
         self.__thumb = None
+        self.thumb_version = 0
+        # tiles redrawn since the thumbnail last caught up
+        self.thumb_dirty = set()
         self.__tooltip = None
+        self.__tooltip_key = None
+        self.__tile_tooltip = None
+        self.__tile_tooltip_key = None
 
     @property
     def surf(self):
@@ -806,28 +282,43 @@ class Map(object):
             self.make_surf()
         return self.__surf
 
-    def rand_spawn(self):
-        i = 0
-        for y in range(MAP_SIZE):
-            for x in range(MAP_SIZE):
-                if self.tiles[y][x].resource:
-                    i += 1
-        self.res_count = i
-        if self.res_count < 40:
-            spawned = False
-            while not spawned:
-                y = random.randint(0, MAP_SIZE-1)
-                x = random.randint(0, MAP_SIZE-1)
-                if self.tiles[y][x].resource is None:
-                    spawned = True
-                    self.tiles[y][x].spawn()
+    def tile_tooltip(self, tile):
+        # the same surface while nothing it shows has changed, so the overlay can stay put
+        seconds = None if tile.timer is None else int(tile.timer.value/ONE_SEC)
+        key = (tile, self.map.version, player.version, seconds)
+        if self.__tile_tooltip_key != key:
+            self.__tile_tooltip_key = key
+            self.__tile_tooltip = make_tile_tooltip(tile)
+        return self.__tile_tooltip
+
+    def redraw_tile(self, tile):
+        rect = get_tile_rect(tile)
+        draw_tile(self.__surf, tile, rect, self.status_square)
+        self.thumb_dirty.add(tile)
+        return rect
 
     def make_surf(self):
-        self.__surf = pygame.Surface((MAP_SIZE * TILE_WIDTH, MAP_SIZE * TILE_WIDTH))
-        self.__surf.fill(WHITE)
-        for y in range(MAP_SIZE):
-            for x in range(MAP_SIZE):
-                self.tiles[y][x].draw(self.__surf)
+        # blits only what changed into the kept surface and returns the rects it touched
+        if self.__surf is None:
+            self.__surf = pygame.Surface((MAP_SIZE * TILE_WIDTH, MAP_SIZE * TILE_WIDTH))
+            self.__surf.fill(WHITE)
+            changed = set(tile for row in self.map.tiles for tile in row)
+        else:
+            changed = set(self.map.dirty)
+        self.map.dirty.clear()
+        for tile in self.map.active_tiles:
+            progress = tile.progress
+            if progress is not None and self.shown_progress.get(tile) != int(progress):
+                changed.add(tile)
+        rects = []
+        for tile in changed:
+            progress = tile.progress
+            if progress is None:
+                self.shown_progress.pop(tile, None)
+            else:
+                self.shown_progress[tile] = int(progress)
+            rects.append(self.redraw_tile(tile))
+        return rects
 
     @property
     def thumb(self):
@@ -836,20 +327,39 @@ class Map(object):
         return self.__thumb
 
     def make_thumb(self):
-        self.__thumb = pygame.transform.smoothscale(self.surf, (TILE_WIDTH, TILE_HEIGHT))
+        self.__thumb = pygame.Surface((TILE_WIDTH, TILE_HEIGHT))
+        self.thumb_dirty.update(tile for row in self.map.tiles for tile in row)
+        self.update_thumb()
+
+    def update_thumb(self):
+        # each changed tile is shrunk into its own cell rather than rescaling the island
+        self.make_surf()
+        if self.__thumb is None or not self.thumb_dirty:
+            return
+        for tile in self.thumb_dirty:
+            tile_rect = get_tile_rect(tile)
+            self.__thumb.blit(get_thumb_cell(tile, self.surf.subsurface(tile_rect)),
+                              THUMB_CELLS[(tile.grid_x, tile.grid_y)])
+        self.thumb_dirty.clear()
+        self.thumb_version += 1
 
     @property
     def tooltip(self):
-        if self.__tooltip is None:
+        if self.__tooltip is None or self.__tooltip_key != self.tooltip_key():
             self.make_tooltip()
         return self.__tooltip
 
+    def tooltip_key(self):
+        return (self.map.version, self.map.available_workers, self.map.population, self.map.beds,
+                self.map.available_power, self.map.max_power)
+
     def make_tooltip(self):
-        pop_str = '/'.join(('{:,}'.format(self.available_workers),
-                            '{:,}'.format(self.population),
-                            '{:,}'.format(self.beds)))
-        pow_str = '/'.join(('{:,}'.format(self.available_power),
-                            '{:,}'.format(self.max_power)))
+        self.__tooltip_key = self.tooltip_key()
+        pop_str = '/'.join(('{:,}'.format(self.map.available_workers),
+                            '{:,}'.format(self.map.population),
+                            '{:,}'.format(self.map.beds)))
+        pow_str = '/'.join(('{:,}'.format(self.map.available_power),
+                            '{:,}'.format(self.map.max_power)))
         tool_list = []
         tool_list.append(TextLine('Population: '+pop_str))
         tool_list.append(TextLine('  (avail./total/max)'))
@@ -859,45 +369,13 @@ class Map(object):
         tool_list.append(TextLine(''))
         tool_list.append(TextLine('contains: '))
         tool_list.append(TextLine(''))
-        resource_count = defaultdict(int)
-        for y in range(MAP_SIZE):
-            for x in range(MAP_SIZE):
-                if self.tiles[y][x].resource:
-                    resource_count[self.tiles[y][x].resource] += 1
+        resource_count = self.map.resource_count()
         for res in RESOURCES:
             if res in resource_count:
                 tool_list.append(TextLine(ITEMS[res]['i_cap']+': '+str(resource_count[res])))
 
         self.__tooltip = ToolTip(tool_list, BLACK)
 
-    def clean(self):
-        self.__surf = None
-        self.__thumb = None
-        self.__tooltip = None
-        for row in self.tiles:
-            for tile in row:
-                tile.clean()
-
-
-class Timer(object):
-    def __init__(self, ticks, action, kwargs, repeat=False):
-        self.ticks = ticks
-        self.value = ticks
-        self.action = action
-        self.kwargs = kwargs
-        self.repeat = repeat
-        self.done = False
-
-    def tick(self):
-        self.value -= 1
-        if self.value == 0:
-            self.action(**self.kwargs)
-            if self.repeat:
-                self.value = self.ticks
-            else:
-                self.done = True
-                return 'done'
-
 
 class Button(object):
     def __init__(self, w, h, string=None, font_color=BLACK, font='medium', bg_color=WHITE):
@@ -956,7 +434,7 @@ class BuyMap(object):
         for pair in lines:
             pygame.draw.line(self.__surf, BLACK, pair[0], pair[1], 1)
 
-        text_surface = FONTS['20'].render('BUY', True, BLACK)
+        text_surface = texts.render(FONTS['20'], 'BUY', BLACK)
         text_rect = text_surface.get_rect(center=self.__surf.get_rect().center)
         text_rect.bottom = (TILE_HEIGHT/2)-2
         self.__surf.blit(text_surface, text_rect)
@@ -964,9 +442,9 @@ class BuyMap(object):
     def draw(self, surf, pos, cash_available):
         surf.blit(self.surf, pos)
         if cash_available >= self.cost:
-            text_surface = FONTS['20'].render('{:,}'.format(self.cost)+' C', True, BLACK)
+            text_surface = texts.render(FONTS['20'], '{:,}'.format(self.cost)+' C', BLACK)
         else:
-            text_surface = FONTS['20'].render('{:,}'.format(self.cost)+' C', True, WHITE)
+            text_surface = texts.render(FONTS['20'], '{:,}'.format(self.cost)+' C', WHITE)
         text_rect = text_surface.get_rect(center=self.surf.get_rect().center)
         text_rect.top = (TILE_HEIGHT/2)+2
         relpos = (text_rect.left + pos[0], text_rect.top + pos[1])
@@ -988,6 +466,9 @@ class Perk(object):
         self.status = 'unavailable'
         self.update_status()
         self.__surf = None
+        # what the surf and tooltip were last made from
+        self.__surf_status = None
+        self.__tooltip_key = None
         self.rect = self.surf.get_rect(topleft=(PERK_OFFSET+self.pos[0]*(PERK_DIST+PERK_WIDTH),
                                                 PERK_OFFSET+self.pos[1]*(PERK_DIST+PERK_HEIGHT)))
         self.__tooltip = None
@@ -1009,13 +490,14 @@ class Perk(object):
 
     @property
     def surf(self):
-        if self.__surf is None:
+        if self.__surf is None or self.__surf_status != self.status:
             self.make_surf()
         return self.__surf
 
     def make_surf(self):
         self.__surf = pygame.Surface((PERK_WIDTH, PERK_HEIGHT))
         self.__surf.fill(WHITE)
+        self.__surf_status = self.status
 
         if self.status == 'purchased':
             self.__surf.fill(LIGHTGREEN)
@@ -1046,11 +528,15 @@ class Perk(object):
 
     @property
     def tooltip(self):
-        if self.__tooltip is None:
+        if self.__tooltip is None or self.__tooltip_key != self.tooltip_key():
             self.set_tooltip()
         return self.__tooltip
 
+    def tooltip_key(self):
+        return self.status, player.inventory['coins'] >= self.cost
+
     def set_tooltip(self):
+        self.__tooltip_key = self.tooltip_key()
         text_list = []
         description_lines = get_textlines(self.description, 200)
         for text in description_lines:
@@ -1114,30 +600,6 @@ def get_textlines(string, margin, centered=True, color=BLACK, font='medium', bg=
     return textlines
 
 
-def get_name(item, num, cap):
-    if num == 1 or num == -1:
-        if cap:
-            return ITEMS[item]['i_cap']
-        else:
-            return ITEMS[item]['lower']
-    else:
-        if cap:
-            return ITEMS[item]['plural_i_cap']
-        else:
-            return ITEMS[item]['plural']
-
-
-def get_map_cost(grid_pos):
-    if 0 <= grid_pos[0] <= 8 and 0 <= grid_pos[1] <= 8:
-        x = abs(grid_pos[0]-4)
-        y = abs(grid_pos[1]-4)
-        radius = max(x, y)
-        cost = MAP_COSTS[radius]
-        return cost
-    else:
-        return 0
-
-
 def do_confirm_popup(texts):
     question_texts = [TextLine(text) for text in texts]
     menuw = 200
@@ -1186,6 +648,13 @@ page_select_rect = None
 page_select_surfs = {}
 
 
+def update_pages():
+    global pages
+    if player.can_buy and 'Buy' not in pages:
+        pages = ['Inventory', 'Use', 'Buy', 'Craft', 'Build', 'Perks']
+        do_page_select_surfs()
+
+
 def do_page_select_surfs():
     global page_surfaces
     global page_select_rect
@@ -1274,15 +743,15 @@ def do_crafting_popup(item):
         bar.draw()
         craft_result_num = craft_num*player.recipes[item]['gives'][item]
         craft_text = 'Gives: '+'{:,}'.format(craft_result_num)+' '+get_name(item, craft_result_num, False)
-        menu.blit(FONTS['medium'].render(craft_text, True, BLACK), (25, 10))
-        menu.blit(FONTS['medium'].render('Cost:', True, BLACK), (25, 125))
+        menu.blit(texts.render(FONTS['medium'], craft_text, BLACK), (25, 10))
+        menu.blit(texts.render(FONTS['medium'], 'Cost:', BLACK), (25, 125))
         i = 0
         for key, value in player.recipes[item]['costs'].items():
             if key != 'energy' or player.free_crafting is False:
                 craft_num_str = '{:,}'.format(value*craft_num)
                 inv_num_str = '{:,}'.format(player.inventory[key])
                 tmp_str = ITEMS[key]['i_cap']+': '+craft_num_str+' ('+inv_num_str+')'
-                tmp_text = FONTS['medium'].render(tmp_str, True, BLACK)
+                tmp_text = texts.render(FONTS['medium'], tmp_str, BLACK)
                 menu.blit(tmp_text, (50, 150 + i))
                 i += tmp_text.get_height()
         for event in pygame.event.get():
@@ -1323,17 +792,17 @@ def do_build_popup(item, cur_map):
         mouse = pygame.mouse.get_pos()
         map_mouse = get_rel_mouse(mouse, mapArea)
         menu_mouse = get_rel_mouse(mouse, menu)
-        menu.blit(FONTS['medium'].render('Choose where to build a '+item, True, BLACK), (25, 10))
-        menu.blit(FONTS['medium'].render('by clicking on the tile on the left.', True, BLACK), (25, 30))
-        menu.blit(FONTS['medium'].render('Build: '+ITEMS[item]['lower'], True, BLACK), (50, 85))
-        menu.blit(FONTS['medium'].render('Cost:', True, BLACK), (50, 115))
+        menu.blit(texts.render(FONTS['medium'], 'Choose where to build a '+item, BLACK), (25, 10))
+        menu.blit(texts.render(FONTS['medium'], 'by clicking on the tile on the left.', BLACK), (25, 30))
+        menu.blit(texts.render(FONTS['medium'], 'Build: '+ITEMS[item]['lower'], BLACK), (50, 85))
+        menu.blit(texts.render(FONTS['medium'], 'Cost:', BLACK), (50, 115))
         i = 0
         for key, value in player.buildables[item]['buildcosts'].items():
             if key != 'energy' or player.free_building is False:
                 bld_num_str = '{:,}'.format(value)
                 inv_num_str = '{:,}'.format(player.inventory[key])
                 tmp_str = ITEMS[key]['i_cap']+': '+bld_num_str+' ('+inv_num_str+')'
-                tmp_text = FONTS['medium'].render(tmp_str, True, BLACK)
+                tmp_text = texts.render(FONTS['medium'], tmp_str, BLACK)
                 menu.blit(tmp_text, (100, 140 + i))
                 i += tmp_text.get_height()
         xgrid = int(map_mouse[0]//TILE_WIDTH)
@@ -1348,7 +817,7 @@ def do_build_popup(item, cur_map):
                 target_tile.fill(RED)
             if RESOURCES[item].get('workradius', 0) > 0:
                 draw_radius_surface((xgrid, ygrid), RESOURCES[item]['workradius'])
-            mapArea.blit(target_tile, tile.rect.topleft)
+            mapArea.blit(target_tile, get_tile_rect(tile).topleft)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
@@ -1397,13 +866,13 @@ def do_using_popup(item):
             use_number = int(round(bar.maximum * use_portion, 0))
             bar.val = use_number
             bar.draw()
-            menu.blit(FONTS['medium'].render('Use: '+'{:,}'.format(use_number)+' '+get_name(item, use_number, False),
-                                             True, BLACK), (25, 10))
-            menu.blit(FONTS['medium'].render('Gives:', True, BLACK), (25, 125))
+            use_str = 'Use: '+'{:,}'.format(use_number)+' '+get_name(item, use_number, False)
+            menu.blit(texts.render(FONTS['medium'], use_str, BLACK), (25, 10))
+            menu.blit(texts.render(FONTS['medium'], 'Gives:', BLACK), (25, 125))
             i = 0
             for key, value in player.usables[item]['gives'].items():
                 tmpstr = ITEMS[key]['i_cap']+': '+'{:,}'.format(value*use_number)
-                tmptext = FONTS['medium'].render(tmpstr, True, BLACK)
+                tmptext = texts.render(FONTS['medium'], tmpstr, BLACK)
                 menu.blit(tmptext, (50, 150 + i))
                 i += tmptext.get_height()
             for event in pygame.event.get():
@@ -1518,7 +987,7 @@ def get_usables_surfs():
 
 def get_sell_buttons():
     sell_buttons = []
-    height = FONTS['medium'].render('10', True, BLACK).get_height()
+    height = texts.render(FONTS['medium'], '10', BLACK).get_height()
     i = 100
     for key, value in player.inventory.items():
         if key not in INVENTORY_EXCLUDE and key in player.known_items:
@@ -1543,7 +1012,7 @@ def get_sell_buttons():
 
 def get_buy_buttons():
     buy_buttons = []
-    height = FONTS['medium'].render('10', True, BLACK).get_height()
+    height = texts.render(FONTS['medium'], '10', BLACK).get_height()
     i = 100
     for key, value in player.inventory.items():
         if key not in BUY_EXCLUDE and key in player.known_items:
@@ -1567,8 +1036,14 @@ def get_buy_buttons():
     return buy_buttons
 
 
-def make_perk_surf(surface, game_perks, rel_mouse):
-    mouse = pygame.mouse.get_pos()
+PAGE_ITEMS = {'Inventory': get_sell_buttons,
+              'Use': get_usables_surfs,
+              'Buy': get_buy_buttons,
+              'Craft': get_recipe_surfs,
+              'Build': get_build_surfs}
+
+
+def make_perk_surf(surface, game_perks, hovered):
     surface.fill(WHITE)
     '''Draw lines to show dependencies'''
     for perk in game_perks:
@@ -1582,8 +1057,7 @@ def make_perk_surf(surface, game_perks, rel_mouse):
                 x2 = (PERK_OFFSET+PERK_WIDTH/2)+PERKS[target]['pos'][0]*(PERK_WIDTH+PERK_DIST)
                 y2 = (PERK_OFFSET+PERK_HEIGHT/2)+PERKS[target]['pos'][1]*(PERK_HEIGHT+PERK_DIST)
                 target_pos = (x2, y2)
-                if (perkArea.get_rect(topleft=perkArea.get_abs_offset()).collidepoint(mouse) and
-                    perk.rect.collidepoint(rel_mouse)):
+                if perk is hovered:
                     for targ_perk in game_perks:
                         if targ_perk.id == target:
                             if targ_perk.status == 'purchased':
@@ -1600,7 +1074,6 @@ def make_perk_surf(surface, game_perks, rel_mouse):
                     pygame.draw.line(surface, RED, line[0], line[1], 2)
 
     for perk in game_perks:
-        perk.make_surf()
         perk.draw(surface)
 
 
@@ -1625,7 +1098,7 @@ def draw_radius_surface(pos, radius):
 def start_screen():
     global log, player, game, pages
     log = Log()
-    player = Player()
+    player = None
     game = None
     save_exists = os.path.isfile('save.pickle')
     y_spacing = DISPLAY_HEIGHT//4
@@ -1654,12 +1127,16 @@ def start_screen():
                 if start_button.rect.collidepoint(mouse):
                     pages = ['Inventory', 'Use', 'Craft', 'Build', 'Perks']
                     do_page_select_surfs()
-                    game = Game()
+                    world = World()
+                    player = world.player
+                    game = Game(world)
                     game.main()
                 if cheat_button.rect.collidepoint(mouse):
                     pages = ['Inventory', 'Use', 'Craft', 'Build', 'Perks']
                     do_page_select_surfs()
-                    game = Game(cheats=True)
+                    world = World(cheats=True)
+                    player = world.player
+                    game = Game(world)
                     game.main()
                 if save_exists and load_button.rect.collidepoint(mouse):
                     load_game()
@@ -1716,10 +1193,9 @@ def pause_screen():
                     in_menu = False
                 if save_button.rect.collidepoint(game_mouse):
                     with open('save.pickle', 'wb+') as f:
+                        game.saved_at = time.time()
                         log.clean()
                         pickle.dump(log, f)
-                        pickle.dump(player, f)
-                        pickle.dump(pages, f)
                         game.clean()
                         pickle.dump(game, f)
                     log.add_line(TextLine('game saved', GREEN))
@@ -1740,19 +1216,20 @@ def load_game():
     global player, log, game, pages
     with open('save.pickle', 'rb') as f:
         log = pickle.load(f)
-        player = pickle.load(f)
-        pages = pickle.load(f)
-        do_page_select_surfs()
-        game = Game()
         game = pickle.load(f)
+    player = game.world.player
+    pages = ['Inventory', 'Use', 'Craft', 'Build', 'Perks']
+    do_page_select_surfs()
+    update_pages()
     game.page_select_surf = page_select_surfs[game.cur_page]
     game.energy_text.rect.x, game.energy_text.rect.y = 50, 6
+    game.catch_up(time.time() - game.saved_at)
     game.main()
 
 
 class Game(object):
-    def __init__(self, cheats=False):
-        self.cheats = cheats
+    def __init__(self, world):
+        self.world = world
         self.mouse = pygame.mouse.get_pos()
         self.game_mouse = get_rel_mouse(self.mouse, gameArea)
         self.map_mouse = get_rel_mouse(self.mouse, mapArea)
@@ -1775,11 +1252,12 @@ class Game(object):
         self.exclude = ['energy', 'coins']
         self.buy_exclude = ['energy', 'coins', 'ironore', 'goldore', 'gold', 'gem']
 
-        self.recipe_surfaces = get_recipe_surfs()
-        self.usables_surfaces = get_usables_surfs()
-        self.build_surfaces = get_build_surfs()
-        self.sell_buttons = get_sell_buttons()
-        self.buy_buttons = get_buy_buttons()
+        self.page_items = {}
+        self.recipe_surfaces = self.get_page_items('Craft')
+        self.usables_surfaces = self.get_page_items('Use')
+        self.build_surfaces = self.get_page_items('Build')
+        self.sell_buttons = self.get_page_items('Inventory')
+        self.buy_buttons = self.get_page_items('Buy')
 
         self.perks = []
         perk_max_x = 0
@@ -1791,161 +1269,236 @@ class Game(object):
 
         self.perk_window = ScrollWindow((perk_max_x, perk_max_y), (450, 450), WHITE)
 
-        make_perk_surf(self.perk_window.full_surf, self.perks, self.perk_mouse)
-
         self.page_select_surf = page_select_surfs[pages[0]]
 
         self.tooltip = None
 
-        player.learn_recipe('stick')
-        player.learn_building('animal trap')
-        player.adjust_inventory('energy', 100)
-        if cheats:
-            player.adjust_inventory('wood', 100000)
-            player.adjust_inventory('stick', 100000)
-            player.adjust_inventory('stone', 100000)
-            player.adjust_inventory('sand', 100000)
-            player.adjust_inventory('glass', 100000)
-            player.adjust_inventory('ironore', 100000)
-            player.adjust_inventory('goldore', 100000)
-            player.adjust_inventory('iron', 100000)
-            player.adjust_inventory('gold', 100000)
-            player.adjust_inventory('food', 100000)
-            player.adjust_inventory('coins', 100000)
-
-        self.maps = [[None]*MAP_SIZE for _ in range(MAP_SIZE)]
-        self.maps[4][4] = BuyMap(0)
-        self.buy_map((4, 4))
-        self.cur_map = self.maps[4][4]
-        self.last_map = {1: None, 2: None}
-
-        self.tracker = 0
-
-        pygame.time.set_timer(GAME_TICK, int(1000//TICKS_PER_SEC))
-        self.timers = [
-                       Timer(5*ONE_SEC, self.regen_energy, {}, True),
-                       Timer(5*ONE_SEC, self.all_maps_spawn, {}, True),
-                       Timer(int(ONE_SEC/20), self.update_map_surf, {}, True),
-                       Timer(int(ONE_SEC/10), self.update_map_thumbs, {}, True),
-                       Timer(ONE_SEC, self.update_item_history, {}, True)
-        ]
+        self.cur_map = self.world.maps[4][4]
+        self.island_views = {}
+        self.buy_maps = {}
+
+        # view-side timers; the simulation keeps its own scheduler in self.world. They
+        # are periodic, so ticks run as one batch fire each of them once with a count
+        self.timers = Scheduler()
+        self.timers.add_periodic(Timer(int(ONE_SEC/20), self.update_map_surf, {}))
+        self.timers.add_periodic(Timer(int(ONE_SEC/10), self.update_map_thumbs, {}))
+        self.timers.add_periodic(Timer(ONE_SEC, self.update_item_history, {}))
 
         self.item_history = None
         self.initialize_item_history()
+        self.saved_at = None
+
+        self.init_drawing()
+
+    def init_drawing(self):
+        # damage tracking for drawgame, rebuilt rather than saved
+        # hovered perk and perk statuses the perk window was last drawn with
+        self.perk_tree = None
+        # mouseover charts, good until the next history update
+        self.item_charts = {}
+        # which history tier the charts show, picked with the mouse wheel
+        self.chart_tier = 0
+        # the map view, and what each of its cells was last drawn from
+        self.overview = None
+        self.overview_cells = {}
+        self.overview_version = 0
+        self.perk_count = None
+        self.region_keys = {}
+        self.map_damage = []
+        self.overlay = None
+        self.fps_rect = pygame.Rect(0, 0, 0, 0)
+        self.pop_text = None
+        self.item_rects = {}
+        # ticks run since rate_since, turned into tick_rate about once a second
+        self.tick_count = 0
+        self.tick_rate = 0
+        self.rate_since = pygame.time.get_ticks()
 
     def __getstate__(self):
         odict = self.__dict__.copy()
         del odict['energy_bar']
+        del odict['island_views']
+        del odict['buy_maps']
+        del odict['page_items']
+        for key in ['region_keys', 'map_damage', 'overlay', 'fps_rect', 'pop_text', 'item_rects',
+                    'tick_count', 'tick_rate', 'rate_since', 'perk_tree', 'perk_count',
+                    'overview', 'overview_cells', 'overview_version', 'item_charts', 'chart_tier']:
+            del odict[key]
         return odict
 
     def __setstate__(self, state):
+        player = state['world'].player
         self.energy_bar = StatusBar(gameDisplay, 200, 15, 100, 20, GREEN, WHITE, BLACK)
         self.energy_bar.maximum = player.max_energy
         self.energy_bar.val = player.inventory['energy']
+        self.island_views = {}
+        self.buy_maps = {}
+        self.page_items = {}
         self.__dict__.update(state)
-
-    def regen_energy(self):
-        if not self.cheats:
-            player.adjust_inventory('energy', 1)
+        self.init_drawing()
+
+    def get_page_items(self, page):
+        # a page's buttons and lines only change when the player does
+        if page not in self.page_items or self.page_items[page][0] != player.version:
+            self.page_items[page] = (player.version, PAGE_ITEMS[page]())
+        return self.page_items[page][1]
+
+    def step(self, ticks):
+        # any number of ticks in one pass through the schedulers
+        if ticks > MAX_STEP_TICKS:
+            self.world.catch_up(ticks)
         else:
-            player.adjust_inventory('energy', 100)
+            self.world.advance(ticks)
+            self.tick_count += ticks
+        self.timers.advance(ticks)
+        self.drain_messages()
+        now = pygame.time.get_ticks()
+        if now - self.rate_since >= 1000:
+            self.tick_rate = self.tick_count*1000.0/(now - self.rate_since)
+            self.tick_count = 0
+            self.rate_since = now
+
+    def catch_up(self, seconds):
+        ticks = int(seconds*TICKS_PER_SEC)
+        if ticks > 0:
+            self.world.catch_up(ticks)
+            self.drain_messages()
+            minutes, secs = divmod(int(seconds), 60)
+            hours, minutes = divmod(minutes, 60)
+            log.add_line(TextLine('away for {}:{:02}:{:02}'.format(hours, minutes, secs), GREEN))
+
+    def get_island_view(self, tile_map):
+        pos = (tile_map.grid_x, tile_map.grid_y)
+        if pos not in self.island_views:
+            self.island_views[pos] = IslandView(tile_map)
+        return self.island_views[pos]
+
+    def get_buy_map(self, grid_pos):
+        if grid_pos not in self.buy_maps:
+            self.buy_maps[grid_pos] = BuyMap(self.world.map_costs[grid_pos])
+        return self.buy_maps[grid_pos]
+
+    def drain_messages(self):
+        while player.messages:
+            log.add_line(TextLine(player.messages.popleft()))
 
     def initialize_item_history(self):
-        self.item_history = {key: [None] for key in player.inventory}
-        for i in range(59):
-            for key in self.item_history:
-                if i == 58:
-                    self.item_history[key].append(0)
-                else:
-                    self.item_history[key].append(None)
+        self.item_history = {key: ItemHistory() for key in player.inventory}
+        for key in self.item_history:
+            self.item_history[key].append(0)
 
-    def update_item_history(self):
+    def update_item_history(self, count=1):
         for item in player.inventory:
-            self.item_history[item].append(player.inventory[item])
-            del self.item_history[item][0]
+            self.item_history[item].append(player.inventory[item], count)
+        self.item_charts = {}
 
     def unflash_energy_bar(self):
         self.energy_bar_flash = False
 
-    def all_maps_spawn(self):
-        for row in self.maps:
-            for my_map in row:
-                if type(my_map) is Map:
-                    my_map.rand_spawn()
-
-    def update_map_surf(self):
-        self.cur_map.make_surf()
+    def update_map_surf(self, count=1):
+        self.map_damage.extend(self.get_island_view(self.cur_map).make_surf())
 
-    def update_map_thumbs(self):
+    def update_map_thumbs(self, count=1):
         if self.map_view:
-            for y, row in enumerate(self.maps):
-                for x, map in enumerate(row):
-                    if type(map) is Map and x == self.tracker:
-                        map.make_surf()
-                        map.make_thumb()
-                        map.make_tooltip()
-            self.tracker += 1
-            if self.tracker == 9:
-                self.tracker = 0
+            self.force_update_map_thumbs()
 
     def force_update_map_thumbs(self):
-        for y, row in enumerate(self.maps):
-                for x, map in enumerate(row):
-                    if type(map) is Map:
-                        map.make_surf()
-                        map.make_thumb()
-                        map.make_tooltip()
-
-    def buy_map(self, grid_pos):
-        map = self.maps[grid_pos[1]][grid_pos[0]]
-        x = abs(grid_pos[0] - 4)
-        y = abs(grid_pos[1] - 4)
-        radius = max(x, y)
-        adjacent_maps = [(-1, 0), (0, -1), (1, 0), (0, 1)]
-        if type(map) is BuyMap:
-            player.adjust_inventory('coins', -map.cost)
-            if radius == 0:
-                tilemap = tilemaps.tilemap1
-            elif radius == 1:
-                while True:
-                    tilemap = random.choice([tilemaps.tilemap2, tilemaps.tilemap3, tilemaps.tilemap4])
-                    if self.last_map[1] != tilemap:
-                        self.last_map[1] = tilemap
-                        break
-            elif radius == 2:
-                while True:
-                    tilemap = random.choice([tilemaps.tilemap5, tilemaps.tilemap6, tilemaps.tilemap7])
-                    if self.last_map[2] != tilemap:
-                        self.last_map[2] = tilemap
-                        break
-            elif radius == 3:
-                if grid_pos[0] == 1:
-                    if grid_pos[1] == 1:
-                        tilemap = tilemaps.tilemap15
-                    elif grid_pos[1] == 7:
-                        tilemap = tilemaps.tilemap14
-                    else:
-                        tilemap = tilemaps.tilemap11
-                elif grid_pos[0] == 7:
-                    if grid_pos[1] == 1:
-                        tilemap = tilemaps.tilemap12
-                    elif grid_pos[1] == 7:
-                        tilemap = tilemaps.tilemap13
+        # islands where nothing changed have nothing to redo
+        for tile_map in self.world.iter_maps():
+            self.get_island_view(tile_map).update_thumb()
+
+    def click_tile(self, tile, event):
+        if event.button == 1:
+            if tile.mine_costs:
+                for key, value in tile.mine_costs.items():
+                    if key == 'energy' and player.inventory[key] < value:
+                        if self.energy_bar_flash:
+                            self.energy_bar_flash = False
+                        else:
+                            self.energy_bar_flash = True
+                            self.timers.add(Timer(5, self.unflash_energy_bar, {}))
+            if tile.resource and tile.status not in ['mined', 'building'] and tile.minable():
+                if RESOURCES[tile.resource].get('confirmdestroy', False):
+                    if do_confirm_popup(['Are you sure you want', 'to destroy this '+tile.resource+'?']):
+                        tile.begin_mine()
+                else:
+                    tile.begin_mine()
+        elif event.button == 3:
+            if tile.resource and tile.resource in BUILDABLES and tile.status not in ['building', 'mined']:
+                menu_items = []
+                can_recruit = False
+                can_destroy = False
+                if tile.resource == 'house':
+                    if tile.can_recruit():
+                        color1 = BLACK
+                        can_recruit = True
                     else:
-                        tilemap = tilemaps.tilemap9
+                        color1 = GREY
+                    menu_items.append(TextLine('Recruit worker ('+str(tile.recruit_cost)+' Coins)',
+                                               color1, return_val='recruit'))
+                if tile.minable():
+                    color2 = BLACK
+                    can_destroy = True
                 else:
-                    if grid_pos[1] == 1:
-                        tilemap = tilemaps.tilemap8
-                    elif grid_pos[1] == 7:
-                        tilemap = tilemaps.tilemap10
-            else:
-                tilemap = tilemaps.tilemap16
-
-            self.maps[grid_pos[1]][grid_pos[0]] = Map(tilemap)
-            for rel_pos in adjacent_maps:
-                pos = (grid_pos[0]+rel_pos[0], grid_pos[1]+rel_pos[1])
-                if 0 <= pos[0] <= 8 and 0 <= pos[1] <= 8 and self.maps[pos[1]][pos[0]] is None:
-                    self.maps[pos[1]][pos[0]] = BuyMap(get_map_cost(pos))
+                    color2 = GREY
+                menu_items.append(TextLine('Destroy ', color2, return_val='destroy'))
+                if tile.frequency:
+                    if tile.status != 'disabled':
+                        menu_items.append(TextLine('Disable ', return_val='disable'))
+                    else:
+                        menu_items.append(TextLine('Enable ', return_val='enable'))
+                # Make all choice rects extend to end of menu so you don't have to click the text
+                max_width = max(item.rect.w for item in menu_items)
+                for item in menu_items:
+                    item.rect.w = max_width
+                selection = None
+                menuw = 0
+                menuh = 0
+                for item in menu_items:
+                    item.rect.topleft = (1, menuh)
+                    menuw = max(menuw, item.rect.w + 2)  # pixel buffer of 1 on each side
+                    menuh += item.rect.h
+                greyout = pygame.Surface((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+                greyout.fill(WHITE)
+                greyout.set_alpha(150)
+                gameDisplay.blit(greyout, (0, 0))
+                mouse = pygame.mouse.get_pos()
+                game_mouse = get_rel_mouse(mouse, gameDisplay)
+                menu = gameDisplay.subsurface((game_mouse[0], game_mouse[1], menuw, menuh))
+                menu.fill(WHITE)
+                pygame.draw.rect(menu, BLACK, menu.get_rect(), 1)
+                for item in menu_items:
+                    menu.blit(item.surf, item.rect)
+                pygame.display.flip()
+                in_menu = True
+                while in_menu:
+                    mouse = pygame.mouse.get_pos()
+                    menu_mouse = get_rel_mouse(mouse, menu)
+                    for event in pygame.event.get():
+                        if event.type == pygame.QUIT:
+                            pygame.quit()
+                            quit()
+                        if event.type == pygame.MOUSEBUTTONUP:
+                            for item in menu_items:
+                                if item.rect.collidepoint(menu_mouse):
+                                    selection = item.return_val
+                            in_menu = False
+                if selection == 'recruit' and can_recruit:
+                    tile.recruit()
+                elif selection == 'destroy' and can_destroy:
+                    if tile.resource and tile.status not in ['mined', 'building'] and tile.minable():
+                        if RESOURCES[tile.resource].get('confirmdestroy', False):
+                            if do_confirm_popup(
+                                    ['Are you sure you want', 'to destroy this ' + tile.resource + '?']):
+                                tile.begin_mine()
+                        else:
+                            tile.begin_mine()
+                elif selection == 'enable':
+                    tile.enable()
+                elif selection == 'disable':
+                    tile.disable()
+            elif not tile.resource:
+                tile.spawn(force=True)
 
     def scroll_window(self, win, rel_mouse):
         if win.moving_h:
@@ -1973,17 +1526,212 @@ class Game(object):
         for perk in self.perks:
             perk.clean()
         self.perk_window.clean()
+        self.perk_tree = None
+        self.page_items = {}
         self.page_select_surf = None
-        for row in self.maps:
-            for tmap in row:
-                if tmap is not None:
-                    tmap.clean()
-        self.cur_map.clean()
+        self.island_views = {}
+        self.overview_cells = {}
+        for buy_map in self.buy_maps.values():
+            buy_map.clean()
+
+    def invalidate(self):
+        self.region_keys = {}
 
     def drawgame(self):
+        self.mouse = pygame.mouse.get_pos()
+        self.game_mouse = get_rel_mouse(self.mouse, gameArea)
+        self.map_mouse = get_rel_mouse(self.mouse, mapArea)
+        self.perk_mouse = get_rel_mouse(self.mouse, perkArea)
+        self.energy_bar.val = player.inventory['energy']
+
+        grid_pos = get_grid_pos(self.map_mouse)
+        draw_radius_pos = None
+        if not self.map_view and grid_pos is not None:
+            if self.cur_map.tiles[grid_pos[1]][grid_pos[0]].work_radius is not None:
+                draw_radius_pos = grid_pos
+        map_damage = self.map_damage
+        self.map_damage = []
+
+        # each region is redrawn only when what it shows has changed, or when the
+        # overlay drawn over it last frame (or this one) needs clearing
+        regions = [(TOP_RECT, self.top_key(), self.draw_top),
+                   (GAME_RECT, self.game_key(draw_radius_pos), lambda: self.draw_game_area(draw_radius_pos)),
+                   (POP_RECT, self.pop_key(), self.draw_pop),
+                   (SIDE_RECT, self.side_key(), self.draw_side),
+                   (LOG_RECT, log.version, self.draw_log)]
+        full = not self.region_keys
+        if full:
+            gameDisplay.fill(WHITE)
+        if map_damage and not self.map_view and draw_radius_pos is not None:
+            # tiles under the radius overlay can't be copied out on their own
+            self.region_keys.pop(GAME_RECT.topleft, None)
+        damaged = []
+        redrawn = set()
+        for rect, key, draw in regions:
+            if full or self.region_keys.get(rect.topleft) != key:
+                self.region_keys[rect.topleft] = key
+                self.draw_region(rect, draw)
+                damaged.append(rect)
+                redrawn.add(rect.topleft)
+            elif rect is GAME_RECT and map_damage and not self.map_view:
+                # only tiles changed, so only those are copied out of the island surface
+                island_surf = self.get_island_view(self.cur_map).surf
+                offset = mapArea.get_abs_offset()
+                for tile_rect in map_damage:
+                    mapArea.blit(island_surf, tile_rect, tile_rect)
+                    damaged.append(tile_rect.move(offset))
+
+        # the tooltip is blended over the screen, so whatever it covered last frame
+        # or covers now is drawn fresh underneath it, unless it is the same one in
+        # the same place and nothing under it was touched
+        overlay = self.find_overlay(grid_pos)
+        keep = (overlay is not None and overlay == self.overlay and overlay[1].collidelist(damaged) == -1
+                and not overlay[1].colliderect(self.fps_rect)
+                and gameDisplay.get_rect().inflate(-2, -2).contains(overlay[1]))
+        if not keep:
+            for rect, key, draw in regions:
+                if rect.topleft not in redrawn and ((self.overlay is not None and rect.colliderect(self.overlay[1])
+                                                     or overlay is not None and rect.colliderect(overlay[1]))):
+                    self.draw_region(rect, draw)
+                    damaged.append(rect)
+
+        gameDisplay.fill(WHITE, self.fps_rect)
+        damaged.append(self.fps_rect)
+        pygame.draw.rect(gameDisplay, BLACK, gameDisplay.get_rect(), 1)
+        if overlay is not None and not keep:
+            gameDisplay.blit(*overlay)
+            damaged.append(overlay[1])
+        self.overlay = overlay
+        # frames that skip every region can come in under a millisecond, which clock counts as infinite
+        curfps = int(min(clock.get_fps(), 9999))
+        # in the margin left of the game area, which no region draws over
+        fpssurf, fpsrect = text_objects('{} fps'.format(curfps), FONTS['small'])
+        tpssurf, tpsrect = text_objects('{} tps'.format(int(round(self.tick_rate))), FONTS['small'])
+        fpsrect.topleft = (3, GAME_OFFSET[1]+2)
+        tpsrect.topleft = fpsrect.bottomleft
+        gameDisplay.blit(fpssurf, fpsrect)
+        gameDisplay.blit(tpssurf, tpsrect)
+        self.fps_rect = fpsrect.union(tpsrect)
+        damaged.append(self.fps_rect)
+
+        if full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(damaged)
+        clock.tick(MAX_FPS)
+
+    def draw_region(self, rect, draw):
+        gameDisplay.fill(WHITE, rect)
+        draw()
+
+    def top_key(self):
+        return (player.inventory['energy'], player.max_energy, player.inventory['food'],
+                player.inventory['coins'], self.energy_bar_flash)
+
+    def game_key(self, draw_radius_pos):
+        if not self.map_view:
+            # changed tiles come in through map_damage instead
+            return False, self.cur_map.index, draw_radius_pos
+        self.update_overview()
+        return True, self.overview_version
+
+    def update_overview(self):
+        # islands are redrawn when their thumbnail changes, plots for sale when bought
+        # or when the coins cross their cost, which changes the colour of the price
+        if self.overview is None:
+            self.overview = pygame.Surface((MAP_SIZE*TILE_WIDTH, MAP_SIZE*TILE_HEIGHT))
+            self.overview.fill(GREY)
+            self.overview_cells = {}
+        for y, row in enumerate(self.world.maps):
+            for x, tile_map in enumerate(row):
+                pos = (x*TILE_WIDTH, y*TILE_HEIGHT)
+                if tile_map is not None:
+                    island_view = self.get_island_view(tile_map)
+                    thumb = island_view.thumb
+                    key = (island_view, island_view.thumb_version)
+                    if self.overview_cells.get((x, y)) != key:
+                        self.overview.blit(thumb, pos)
+                elif (x, y) in self.world.map_costs:
+                    buy_map = self.get_buy_map((x, y))
+                    key = (buy_map, player.inventory['coins'] >= buy_map.cost)
+                    if self.overview_cells.get((x, y)) != key:
+                        self.overview.fill(GREY, (pos, (TILE_WIDTH, TILE_HEIGHT)))
+                        buy_map.draw(self.overview, pos, player.inventory['coins'])
+                else:
+                    key = None
+                    if self.overview_cells.get((x, y)) is not None:
+                        self.overview.fill(GREY, (pos, (TILE_WIDTH, TILE_HEIGHT)))
+                if self.overview_cells.get((x, y)) != key:
+                    self.overview_cells[(x, y)] = key
+                    self.overview_version += 1
+
+    def pop_key(self):
+        if self.map_view:
+            return None
+        return (self.cur_map.index, self.cur_map.available_workers, self.cur_map.population, self.cur_map.beds,
+                self.cur_map.available_power, self.cur_map.max_power)
+
+    def side_key(self):
+        key = (self.cur_page, player.version)
+        if self.cur_page == 'Perks':
+            # hovering a perk highlights its dependencies
+            key += (tuple(perk.status for perk in self.perks), self.get_hovered_perk(),
+                    self.perk_window.xpos, self.perk_window.ypos)
+        return key
+
+    def get_hovered_perk(self):
+        if self.perk_window.view_surf.get_rect(topleft=perkArea.get_abs_offset()).collidepoint(self.mouse):
+            rel_mouse = (self.perk_mouse[0]+self.perk_window.xpos, self.perk_mouse[1]+self.perk_window.ypos)
+            for perk in self.perk_window.visible_items(self.perks):
+                if perk.rect.collidepoint(rel_mouse):
+                    return perk
+        return None
+
+    def update_perk_tree(self):
+        # the tree stays drawn in the scroll window; a perk whose status changed is
+        # blitted over its old self, and only highlighting dependencies redraws the lines
+        hovered = self.get_hovered_perk()
+        if hovered is not None and hovered.dependencies is None:
+            hovered = None
+        statuses = [perk.status for perk in self.perks]
+        if self.perk_tree is None or self.perk_tree[0] is not hovered:
+            make_perk_surf(self.perk_window.full_surf, self.perks, hovered)
+        else:
+            for perk, status in zip(self.perks, self.perk_tree[1]):
+                if perk.status != status:
+                    perk.draw(self.perk_window.full_surf)
+        self.perk_tree = (hovered, statuses)
+
+    def draw_top(self):
+        gameDisplay.blit(self.energy_text.surf, self.energy_text.rect)
         coins_str = '{:,}'.format(player.inventory['coins'])
         coins_text = TextLine('Coins: '+coins_str, font='large')
         coins_text.rect.topright = (GAME_WIDTH+GAME_OFFSETS['x'], 6)
+        gameDisplay.blit(coins_text.surf, coins_text)
+        self.energy_bar.draw()
+        if self.energy_bar_flash:
+            pygame.draw.rect(gameDisplay, RED, self.energy_bar.get_rect())
+
+        if player.inventory['food'] < 1 or player.inventory['energy'] > (player.max_energy - 1):
+            self.eat_button.font_color = GREY
+        else:
+            self.eat_button.font_color = BLACK
+        self.eat_button.make()
+        gameDisplay.blit(self.eat_button.surf, self.eat_button.rect)
+
+    def draw_game_area(self, draw_radius_pos):
+        gameArea.fill(GREY)
+        gameArea.blit(mapviewbutton, mapviewbuttonpos)
+        if not self.map_view:
+            mapArea.blit(self.get_island_view(self.cur_map).surf, (0, 0))
+        else:
+            self.update_overview()
+            mapArea.blit(self.overview, (0, 0))
+        if draw_radius_pos is not None:
+            draw_radius_surface(draw_radius_pos, self.cur_map.tiles[draw_radius_pos[1]][draw_radius_pos[0]].work_radius)
+        pygame.draw.rect(gameDisplay, BLACK, GAME_AREA_RECT, 1)
+
+    def make_pop_text(self):
         pop_str = '/'.join(('{:,}'.format(self.cur_map.available_workers),
                             '{:,}'.format(self.cur_map.population),
                             '{:,}'.format(self.cur_map.beds)))
@@ -1994,48 +1742,19 @@ class Game(object):
         poptextx = gameArea.get_rect(topleft=GAME_OFFSET).centerx
         poptexty = DISPLAY_HEIGHT-(DISPLAY_HEIGHT-GAME_HEIGHT)/4
         pop_text.rect.center = (poptextx, poptexty)
-        self.mouse = pygame.mouse.get_pos()
-        self.game_mouse = get_rel_mouse(self.mouse, gameArea)
-        self.map_mouse = get_rel_mouse(self.mouse, mapArea)
-        self.perk_mouse = get_rel_mouse(self.mouse, perkArea)
+        return pop_text
 
-        self.energy_bar.val = player.inventory['energy']
-        gameDisplay.fill(WHITE)
-        gameArea.fill(GREY)
-        gameArea.blit(mapviewbutton, mapviewbuttonpos)
-        tooltip = None
-        draw_radius_pos = None
+    def draw_pop(self):
         if not self.map_view:
-            for y in range(MAP_SIZE):
-                for x in range(MAP_SIZE):
-                    if self.cur_map.tiles[y][x].rect.collidepoint(self.map_mouse):
-                        self.cur_map.tiles[y][x].set_tooltip()
-                        tooltip = self.cur_map.tiles[y][x].tooltip
-                        if self.cur_map.tiles[y][x].work_radius is not None:
-                            draw_radius_pos = (x, y)
-
-            mapArea.blit(self.cur_map.surf, (0, 0))
-            gameDisplay.blit(pop_text.surf, pop_text)
-            if pop_text.rect.collidepoint(self.mouse):
-                tooltip = pop_text.tooltip
-        else:
-            for y, row in enumerate(self.maps):
-                for x, map in enumerate(row):
-                    if type(map) is Map:
-                        mapArea.blit(map.thumb, (x*TILE_WIDTH, y*TILE_HEIGHT))
-                        if self.cur_map.tiles[y][x].rect.collidepoint(self.map_mouse):
-                            map.make_tooltip()
-                            tooltip = map.tooltip
-                    elif type(map) is BuyMap:
-                        map.draw(mapArea, (x*TILE_WIDTH, y*TILE_HEIGHT), player.inventory['coins'])
-        if draw_radius_pos is not None:
-            draw_radius_surface(draw_radius_pos, self.cur_map.tiles[draw_radius_pos[1]][draw_radius_pos[0]].work_radius)
+            self.pop_text = self.make_pop_text()
+            gameDisplay.blit(self.pop_text.surf, self.pop_text)
+
+    def draw_log(self):
         if len(log.text_lines) > 0:
             logpos = (GAME_WIDTH + 100, DISPLAY_HEIGHT - 25 - log.surf.get_height())
             gameDisplay.blit(log.surf, logpos)
 
-        pygame.draw.rect(gameDisplay, BLACK, GAME_AREA_RECT, 1)
-        pygame.draw.rect(gameDisplay, BLACK, gameDisplay.get_rect(), 1)
+    def draw_side(self):
         gameDisplay.blit(self.page_select_surf, (GAME_WIDTH + 50 + 10,
                                                  GAME_OFFSET[1] - self.page_select_surf.get_rect().h))
         y_start = GAME_OFFSET[1]
@@ -2045,179 +1764,190 @@ class Game(object):
                          (DISPLAY_WIDTH - 10, y_start + 500), 2)
         pygame.draw.line(gameDisplay, BLACK, (DISPLAY_WIDTH - 10, y_start + 500),
                          (DISPLAY_WIDTH - 10, y_start - 2), 2)
-        gameDisplay.blit(self.energy_text.surf, self.energy_text.rect)
-        gameDisplay.blit(coins_text.surf, coins_text)
-        self.energy_bar.draw()
-        if self.energy_bar_flash:
-            pygame.draw.rect(gameDisplay, RED, self.energy_bar.get_rect())
-
-        if player.inventory['food'] < 1 or player.inventory['energy'] > (player.max_energy - 1):
-            self.eat_button.font_color = GREY
-        else:
-            self.eat_button.font_color = BLACK
-        self.eat_button.make()
-        gameDisplay.blit(self.eat_button.surf, self.eat_button.rect)
 
         if self.cur_page == 'Inventory':
-            self.sell_buttons = get_sell_buttons()
+            self.sell_buttons = self.get_page_items('Inventory')
             for button in self.sell_buttons:
                 gameDisplay.blit(button.surf, button.rect.topleft)
 
-            header_text1 = FONTS['medium'].render('Number', True, BLACK)
-            header_text2 = FONTS['medium'].render('Sell value (All)', True, BLACK)
-            header_text3 = FONTS['medium'].render('Sell', True, BLACK)
+            header_text1 = texts.render(FONTS['medium'], 'Number', BLACK)
+            header_text2 = texts.render(FONTS['medium'], 'Sell value (All)', BLACK)
+            header_text3 = texts.render(FONTS['medium'], 'Sell', BLACK)
             gameDisplay.blit(header_text1, (GAME_WIDTH + 275 - header_text1.get_width(), 75))
             gameDisplay.blit(header_text2, (GAME_WIDTH + 440 - header_text2.get_width(), 75))
             gameDisplay.blit(header_text3, (GAME_WIDTH + 475, 75))
             i = 0
-            text_surfs = {}
+            self.item_rects = {}
             for key, value in player.inventory.items():
                 if key not in self.exclude and key in player.known_items:
-                    tmptext1 = FONTS['medium'].render(ITEMS[key]['i_cap']+':', True, BLACK)
-                    tmptext2 = FONTS['medium'].render('{:,}'.format(value), True, BLACK)
+                    tmptext1 = texts.render(FONTS['medium'], ITEMS[key]['i_cap']+':', BLACK)
+                    tmptext2 = texts.render(FONTS['medium'], '{:,}'.format(value), BLACK)
                     tmptext2x = GAME_WIDTH + 275 - tmptext2.get_width()
                     sell_val = ITEMS[key]['sell_value']
                     tmpstr3 = '{:,}'.format(sell_val)+' ('+'{:,}'.format(value*sell_val)+')'
-                    tmptext3 = FONTS['medium'].render(tmpstr3, True, BLACK)
+                    tmptext3 = texts.render(FONTS['medium'], tmpstr3, BLACK)
                     tmptext3x = GAME_WIDTH + 440 - tmptext3.get_width()
                     gameDisplay.blit(tmptext1, (GAME_WIDTH + 100, 100 + i))
                     gameDisplay.blit(tmptext2, (tmptext2x, 100 + i))
                     gameDisplay.blit(tmptext3, (tmptext3x, 100 + i))
 
-                    text_surfs[key] = {'surf': tmptext1,
-                                       'pos': (GAME_WIDTH + 100, 100 + i)}
+                    self.item_rects[key] = tmptext1.get_rect(topleft=(GAME_WIDTH + 100, 100 + i))
 
                     i += tmptext1.get_height()
-            for item, info in text_surfs.items():
-                if info['surf'].get_rect(topleft=info['pos']).collidepoint(self.mouse):
-                    ymax = max(num for num in self.item_history[item] if num is not None)
-                    ymin = min(num for num in self.item_history[item] if num is not None)
-                    ymax += 1
-                    if ymin > 0:
-                        ymin -= 1
-                    if (ymax - ymin) % 2 != 0:
-                        ymax += 1
-
-                    max_text = FONTS['medium'].render('{:,}'.format(ymax), True, BLACK)
-                    chart_offset = max(20, max_text.get_width() + 15)
-
-                    mouseover_chart = pygame.Surface((chart_offset+CHART_WIDTH+20, CHART_HEIGHT+60))
-                    mouseover_chart.fill(WHITE)
-                    chart_area = mouseover_chart.subsurface((chart_offset, 20, CHART_WIDTH, CHART_HEIGHT))
-
-                    pygame.draw.rect(mouseover_chart, BLACK, mouseover_chart.get_rect(), 1)
-
-                    title_text = FONTS['medium'].render(ITEMS[item]['plural_i_cap']+':', True, BLACK)
-                    mouseover_chart.blit(title_text, title_text.get_rect(center=(chart_offset+CHART_WIDTH/2, 10)))
-                    bottom_text = FONTS['medium'].render('(Seconds ago)', True, BLACK)
-                    mouseover_chart.blit(bottom_text, bottom_text.get_rect(center=(chart_offset+CHART_WIDTH/2,
-                                                                                   CHART_HEIGHT+50)))
-
-                    zero_secs = FONTS['medium'].render('0', True, BLACK)
-                    mouseover_chart.blit(zero_secs, zero_secs.get_rect(center=(chart_offset+CHART_WIDTH,
-                                                                               CHART_HEIGHT+33)))
-                    thirty_secs = FONTS['medium'].render('30', True, BLACK)
-                    mouseover_chart.blit(thirty_secs, thirty_secs.get_rect(center=(chart_offset+CHART_WIDTH/2,
-                                                                                   CHART_HEIGHT+33)))
-                    sixty_secs = FONTS['medium'].render('60', True, BLACK)
-                    mouseover_chart.blit(sixty_secs, sixty_secs.get_rect(center=(chart_offset, CHART_HEIGHT+33)))
-
-                    mouseover_chart.blit(max_text, max_text.get_rect(midright=(chart_offset-5, 20)))
-                    mid_text = FONTS['medium'].render('{:,}'.format(int((ymax+ymin)/2)), True, BLACK)
-                    mouseover_chart.blit(mid_text, mid_text.get_rect(midright=(chart_offset-5, 20+CHART_HEIGHT/2)))
-                    min_text = FONTS['medium'].render('{:,}'.format(ymin), True, BLACK)
-                    mouseover_chart.blit(min_text, min_text.get_rect(midright=(chart_offset-5, 20+CHART_HEIGHT)))
-
-                    pygame.draw.rect(chart_area, BLACK, chart_area.get_rect(), 1)
-                    prev_point = None
-                    for i, val in enumerate(self.item_history[item]):
-                        if val is not None:
-                            if prev_point is not None:
-                                pygame.draw.line(chart_area, GREEN, prev_point,
-                                                 (i*int(CHART_WIDTH/60)+2,
-                                                  int(CHART_HEIGHT-CHART_HEIGHT*((val-ymin)/(ymax-ymin)))-3), 2)
-                            prev_point = (i*int(CHART_WIDTH/60)+2,
-                                          int(CHART_HEIGHT-CHART_HEIGHT*((val-ymin)/(ymax-ymin)))-3)
-                    chart_pos = (self.mouse[0]+20, self.mouse[1]+20)
-                    gameDisplay.blit(mouseover_chart, chart_pos)
 
         elif self.cur_page == 'Use':
-            self.usables_surfaces = get_usables_surfs()
+            self.usables_surfaces = self.get_page_items('Use')
             for usesurf in self.usables_surfaces:
                 gameDisplay.blit(usesurf.surf, (usesurf.rect.x, usesurf.rect.y))
-                if usesurf.rect.collidepoint(self.mouse):
-                    tooltip = usesurf.tooltip
         elif self.cur_page == 'Buy':
-            self.buy_buttons = get_buy_buttons()
+            self.buy_buttons = self.get_page_items('Buy')
             for button in self.buy_buttons:
                 gameDisplay.blit(button.surf, button.rect.topleft)
 
-            header_text1 = FONTS['medium'].render('Number', True, BLACK)
-            header_text2 = FONTS['medium'].render('Cost', True, BLACK)
-            header_text3 = FONTS['medium'].render('Buy', True, BLACK)
+            header_text1 = texts.render(FONTS['medium'], 'Number', BLACK)
+            header_text2 = texts.render(FONTS['medium'], 'Cost', BLACK)
+            header_text3 = texts.render(FONTS['medium'], 'Buy', BLACK)
             gameDisplay.blit(header_text1, (GAME_WIDTH + 275 - header_text1.get_width(), 75))
             gameDisplay.blit(header_text2, (GAME_WIDTH + 340 - header_text2.get_width(), 75))
             gameDisplay.blit(header_text3, (GAME_WIDTH + 375, 75))
             i = 0
-            text_surfs = {}
 
             for key, value in player.inventory.items():
                 if key not in self.buy_exclude and key in player.known_items:
-                    tmptext1 = FONTS['medium'].render(ITEMS[key]['i_cap']+':', True, BLACK)
-                    tmptext2 = FONTS['medium'].render('{:,}'.format(value), True, BLACK)
+                    tmptext1 = texts.render(FONTS['medium'], ITEMS[key]['i_cap']+':', BLACK)
+                    tmptext2 = texts.render(FONTS['medium'], '{:,}'.format(value), BLACK)
                     tmptext2x = GAME_WIDTH + 275 - tmptext2.get_width()
                     buy_val = ITEMS[key]['sell_value']*2
                     tmpstr3 = '{:,}'.format(buy_val)
-                    tmptext3 = FONTS['medium'].render(tmpstr3, True, BLACK)
+                    tmptext3 = texts.render(FONTS['medium'], tmpstr3, BLACK)
                     tmptext3x = GAME_WIDTH + 340 - tmptext3.get_width()
                     gameDisplay.blit(tmptext1, (GAME_WIDTH + 100, 100 + i))
                     gameDisplay.blit(tmptext2, (tmptext2x, 100 + i))
                     gameDisplay.blit(tmptext3, (tmptext3x, 100 + i))
 
-                    text_surfs[key] = {'surf': tmptext1,
-                                       'pos': (GAME_WIDTH + 100, 100 + i)}
-
                     i += tmptext1.get_height()
 
         elif self.cur_page == 'Craft':
-            self.recipe_surfaces = get_recipe_surfs()
+            self.recipe_surfaces = self.get_page_items('Craft')
             for resurf in self.recipe_surfaces:
                 gameDisplay.blit(resurf.surf, (resurf.rect.x, resurf.rect.y))
-                if resurf.rect.collidepoint(self.mouse):
-                    tooltip = resurf.tooltip
         elif self.cur_page == 'Build':
-            self.build_surfaces = get_build_surfs()
+            self.build_surfaces = self.get_page_items('Build')
             for bsurf in self.build_surfaces:
                 gameDisplay.blit(bsurf.surf, (bsurf.rect.x, bsurf.rect.y))
-                if bsurf.rect.collidepoint(self.mouse):
-                    tooltip = bsurf.tooltip
         elif self.cur_page == 'Perks':
-            rel_mouse = (self.perk_mouse[0]+self.perk_window.xpos, self.perk_mouse[1]+self.perk_window.ypos)
-            if self.perk_window.view_surf.get_rect(topleft=perkArea.get_abs_offset()).collidepoint(self.mouse):
-                for perk in self.perks:
-                    if perk.rect.collidepoint(rel_mouse):
-                        perk.set_tooltip()
-                        tooltip = perk.tooltip
-            make_perk_surf(self.perk_window.full_surf, self.perks, rel_mouse)
+            self.update_perk_tree()
             self.perk_window.draw(perkArea, (0, 0))
 
+    def find_overlay(self, grid_pos):
+        # whatever is drawn over the regions this frame: a surface and where it goes
+        tooltip = None
+        if not self.map_view:
+            if grid_pos is not None:
+                tile = self.cur_map.tiles[grid_pos[1]][grid_pos[0]]
+                tooltip = self.get_island_view(self.cur_map).tile_tooltip(tile)
+            if self.pop_text is not None and self.pop_text.rect.collidepoint(self.mouse):
+                tooltip = self.pop_text.tooltip
+        elif grid_pos is not None and self.world.maps[grid_pos[1]][grid_pos[0]] is not None:
+            tooltip = self.get_island_view(self.world.maps[grid_pos[1]][grid_pos[0]]).tooltip
+
+        if self.cur_page == 'Inventory':
+            for item, rect in self.item_rects.items():
+                if rect.collidepoint(self.mouse):
+                    chart = self.get_item_chart(item)
+                    return chart, chart.get_rect(topleft=(self.mouse[0]+20, self.mouse[1]+20))
+        elif self.cur_page in ['Use', 'Craft', 'Build']:
+            surfaces = {'Use': self.usables_surfaces, 'Craft': self.recipe_surfaces, 'Build': self.build_surfaces}
+            for textline in surfaces[self.cur_page]:
+                if textline.rect.collidepoint(self.mouse):
+                    tooltip = textline.tooltip
+        elif self.cur_page == 'Perks':
+            perk = self.get_hovered_perk()
+            if perk is not None:
+                tooltip = perk.tooltip
+
         if tooltip:
-            tooltip.draw(gameDisplay, self.mouse)
-        curfps = int(clock.get_fps())
-        fpssurf, fpsrect = text_objects(str(curfps), FONTS['medium'])
-        gameDisplay.blit(fpssurf, fpsrect)
-        pygame.display.flip()
-        clock.tick()
+            new_pos = (min(self.mouse[0]+10, gameDisplay.get_width()-tooltip.w-1),
+                       max(1, self.mouse[1]-tooltip.h-10))
+            return tooltip, tooltip.get_rect(topleft=new_pos)
+        return None
+
+    def get_item_chart(self, item):
+        key = (item, self.chart_tier)
+        if key not in self.item_charts:
+            self.item_charts[key] = self.make_item_chart(item, self.chart_tier)
+        return self.item_charts[key]
+
+    def make_item_chart(self, item, tier=0):
+        # the last minute by the second, hour by the minute or two days by the hour
+        history = self.item_history[item].tiers[tier]
+        ymax = history.high
+        ymin = history.low
+        ymax += 1
+        if ymin > 0:
+            ymin -= 1
+        if (ymax - ymin) % 2 != 0:
+            ymax += 1
+
+        max_text = texts.render(FONTS['medium'], '{:,}'.format(ymax), BLACK)
+        chart_offset = max(20, max_text.get_width() + 15)
+
+        mouseover_chart = pygame.Surface((chart_offset+CHART_WIDTH+20, CHART_HEIGHT+60))
+        mouseover_chart.fill(WHITE)
+        chart_area = mouseover_chart.subsurface((chart_offset, 20, CHART_WIDTH, CHART_HEIGHT))
+
+        pygame.draw.rect(mouseover_chart, BLACK, mouseover_chart.get_rect(), 1)
+
+        title_text = texts.render(FONTS['medium'], ITEMS[item]['plural_i_cap']+':', BLACK)
+        mouseover_chart.blit(title_text, title_text.get_rect(center=(chart_offset+CHART_WIDTH/2, 10)))
+        bottom_text = texts.render(FONTS['medium'], '('+CHART_UNITS[tier]+' ago)', BLACK)
+        mouseover_chart.blit(bottom_text, bottom_text.get_rect(center=(chart_offset+CHART_WIDTH/2,
+                                                                       CHART_HEIGHT+50)))
+
+        zero_secs = texts.render(FONTS['medium'], '0', BLACK)
+        mouseover_chart.blit(zero_secs, zero_secs.get_rect(center=(chart_offset+CHART_WIDTH,
+                                                                   CHART_HEIGHT+33)))
+        thirty_secs = texts.render(FONTS['medium'], str(history.size//2), BLACK)
+        mouseover_chart.blit(thirty_secs, thirty_secs.get_rect(center=(chart_offset+CHART_WIDTH/2,
+                                                                       CHART_HEIGHT+33)))
+        sixty_secs = texts.render(FONTS['medium'], str(history.size), BLACK)
+        mouseover_chart.blit(sixty_secs, sixty_secs.get_rect(center=(chart_offset, CHART_HEIGHT+33)))
+
+        mouseover_chart.blit(max_text, max_text.get_rect(midright=(chart_offset-5, 20)))
+        mid_text = texts.render(FONTS['medium'], '{:,}'.format(int((ymax+ymin)/2)), BLACK)
+        mouseover_chart.blit(mid_text, mid_text.get_rect(midright=(chart_offset-5, 20+CHART_HEIGHT/2)))
+        min_text = texts.render(FONTS['medium'], '{:,}'.format(ymin), BLACK)
+        mouseover_chart.blit(min_text, min_text.get_rect(midright=(chart_offset-5, 20+CHART_HEIGHT)))
+
+        pygame.draw.rect(chart_area, BLACK, chart_area.get_rect(), 1)
+        # buckets longer than a sample are drawn as their highs and their lows
+        series = [history.highs]
+        if history.period > 1:
+            series.append(history.lows)
+        step = int(CHART_WIDTH/history.size)
+        for values in series:
+            prev_point = None
+            # newest sample on the right edge, however many there are so far
+            for i, val in enumerate(values.values(), history.size - len(history)):
+                if prev_point is not None:
+                    pygame.draw.line(chart_area, GREEN, prev_point,
+                                     (i*step+2, int(CHART_HEIGHT-CHART_HEIGHT*((val-ymin)/(ymax-ymin)))-3), 2)
+                prev_point = (i*step+2, int(CHART_HEIGHT-CHART_HEIGHT*((val-ymin)/(ymax-ymin)))-3)
+        return mouseover_chart
 
     def main(self):
         restart = False
         target = None
+        # wall-clock time not yet turned into simulation ticks
+        lag = 0
+        last = pygame.time.get_ticks()
         while not restart:
             mouse = self.mouse
             game_mouse = self.game_mouse
             map_mouse = self.map_mouse
             perk_mouse = self.perk_mouse
             for event in pygame.event.get():
+                handled_at = pygame.time.get_ticks()
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     quit()
@@ -2228,20 +1958,14 @@ class Game(object):
                     self.page_select_surf = page_select_surfs[self.cur_page]
                     self.energy_text.rect.x, self.energy_text.rect.y = 50, 6
 
-                if event.type == GAME_TICK:
-                    for i, timer in enumerate(self.timers):
-                        if timer.tick() == 'done':
-                            del self.timers[i]
-                    for y1 in rand_row:
-                        for x1 in rand_col:
-                            if type(self.maps[y1][x1]) is Map:
-                                for y2 in rand_row:
-                                    for x2 in rand_col:
-                                        self.maps[y1][x1].tiles[y2][x2].tick()
-                    random.shuffle(rand_row)
-                    random.shuffle(rand_col)
-
                 if event.type == pygame.MOUSEBUTTONDOWN:
+                    if self.cur_page == 'Inventory' and event.button in [4, 5]:
+                        # scrolling over an item steps its chart between minutes, hours and days
+                        if any(rect.collidepoint(mouse) for rect in self.item_rects.values()):
+                            if event.button == 4:
+                                self.chart_tier = max(0, self.chart_tier - 1)
+                            else:
+                                self.chart_tier = min(len(CHART_UNITS) - 1, self.chart_tier + 1)
                     if self.cur_page == 'Perks':
                         perk_mouse = get_rel_mouse(mouse, perkArea)
                         if event.button == 1:
@@ -2266,17 +1990,16 @@ class Game(object):
                             xgrid = int(map_mouse[0]//TILE_WIDTH)
                             ygrid = int(map_mouse[1]//TILE_HEIGHT)
                             if 0 <= xgrid < MAP_SIZE and 0 <= ygrid < MAP_SIZE:
-                                if type(self.maps[ygrid][xgrid]) is Map:
-                                    self.cur_map = self.maps[ygrid][xgrid]
+                                if self.world.maps[ygrid][xgrid] is not None:
+                                    self.cur_map = self.world.maps[ygrid][xgrid]
                                     self.map_view = False
-                                elif (type(self.maps[ygrid][xgrid]) is BuyMap
-                                      and player.inventory['coins'] >= self.maps[ygrid][xgrid].cost):
-                                    self.buy_map((xgrid, ygrid))
+                                elif ((xgrid, ygrid) in self.world.map_costs
+                                      and player.inventory['coins'] >= self.world.map_costs[(xgrid, ygrid)]):
+                                    self.world.buy_map((xgrid, ygrid))
                     else:
-                        for y in range(MAP_SIZE):
-                            for x in range(MAP_SIZE):
-                                if self.cur_map.tiles[y][x].check_mouseover(map_mouse):
-                                    self.cur_map.tiles[y][x].doclick(event)
+                        grid_pos = get_grid_pos(map_mouse)
+                        if grid_pos is not None:
+                            self.click_tile(self.cur_map.tiles[grid_pos[1]][grid_pos[0]], event)
 
                     if event.button == 1:
                         if self.eat_button.rect.collidepoint(mouse):
@@ -2327,9 +2050,10 @@ class Game(object):
                             self.perk_window.moving_v = False
                             if self.perk_window.view_surf.get_rect(topleft=perkArea.get_abs_offset()).collidepoint(mouse):
                                 rel_mouse = (perk_mouse[0]+self.perk_window.xpos, perk_mouse[1]+self.perk_window.ypos)
-                                for perk in self.perks:
+                                for perk in self.perk_window.visible_items(self.perks):
                                     if perk.rect.collidepoint(rel_mouse):
                                         perk.do_click()
+                                        update_pages()
                                         self.page_select_surf = page_select_surfs[self.cur_page]
 
                         for i, page in enumerate(page_surfaces):
@@ -2339,8 +2063,28 @@ class Game(object):
                                 self.cur_page = pages[i]
                                 self.page_select_surf = page_select_surfs[self.cur_page]
 
-            for thing in self.perks:
-                thing.update_status()
+                if event.type in [pygame.KEYUP, pygame.MOUSEBUTTONUP]:
+                    # menus and popups draw straight over the screen, and the game
+                    # stands still while they are up
+                    self.invalidate()
+                    last += pygame.time.get_ticks() - handled_at
+
+            # the simulation steps at a fixed rate however often frames are drawn;
+            # ticks that piled up during a slow frame are run as one batch, and a backlog
+            # of more than a few seconds goes through the offline catch-up instead
+            now = pygame.time.get_ticks()
+            lag += now - last
+            last = now
+            due = int(lag//TICK_MS)
+            if due:
+                lag -= due*TICK_MS
+                self.step(due)
+
+            # a perk only becomes available when another one is bought
+            if self.perk_count != len(player.perks):
+                self.perk_count = len(player.perks)
+                for thing in self.perks:
+                    thing.update_status()
 
             if self.cur_page == 'Perks':
                 perk_mouse = get_rel_mouse(mouse, perkArea)
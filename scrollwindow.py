@@ -36,6 +36,8 @@ class ScrollWindow(object):
                                self.sb_thickness, self.sb_thickness)
         self.moving_h = False
         self.moving_v = False
+        # scroll position the scrollbars in window_surf were drawn for
+        self.__chrome = None
 
     @property
     def full_surf(self):
@@ -55,18 +57,31 @@ class ScrollWindow(object):
             self.__view_surf = self.window_surf.subsurface((0, 0, self.view_size[0], self.view_size[1]))
         return self.__view_surf
 
-    def draw(self, surface, pos):
-        self.window_surf.fill(self.bg_color)
-        self.view_surf.blit(self.full_surf, (-self.xpos, -self.ypos))
+    @property
+    def visible_rect(self):
+        # the part of full_surf showing through the view
+        return pygame.Rect(self.xpos, self.ypos, self.view_size[0], self.view_size[1])
 
-        if self.has_h_sb and self.has_v_sb:
-            pygame.draw.rect(self.window_surf, BLACK, self.bottom_sq_rect, 1)
-        if self.has_h_sb:
-            pygame.draw.rect(self.window_surf, GREY, self.h_sb)
-            pygame.draw.rect(self.window_surf, BLACK, self.h_sb, 1)
-        if self.has_v_sb:
-            pygame.draw.rect(self.window_surf, GREY, self.v_sb)
-            pygame.draw.rect(self.window_surf, BLACK, self.v_sb, 1)
+    def visible_items(self, items):
+        # for content that only needs to draw or hit-test what can be seen
+        visible = self.visible_rect
+        return [item for item in items if visible.colliderect(item.rect)]
+
+    def draw(self, surface, pos):
+        if self.__chrome != (self.xpos, self.ypos):
+            self.__chrome = (self.xpos, self.ypos)
+            self.window_surf.fill(self.bg_color)
+            if self.has_h_sb and self.has_v_sb:
+                pygame.draw.rect(self.window_surf, BLACK, self.bottom_sq_rect, 1)
+            if self.has_h_sb:
+                pygame.draw.rect(self.window_surf, GREY, self.h_sb)
+                pygame.draw.rect(self.window_surf, BLACK, self.h_sb, 1)
+            if self.has_v_sb:
+                pygame.draw.rect(self.window_surf, GREY, self.v_sb)
+                pygame.draw.rect(self.window_surf, BLACK, self.v_sb, 1)
+        elif self.full_size[0] < self.view_size[0] or self.full_size[1] < self.view_size[1]:
+            self.view_surf.fill(self.bg_color)
+        self.view_surf.blit(self.full_surf, (0, 0), self.visible_rect)
         pygame.draw.rect(self.view_surf, BLACK, self.view_surf.get_rect(), 1)
         pygame.draw.rect(self.window_surf, BLACK, self.window_surf.get_rect(), 1)
         surface.blit(self.window_surf, pos)
@@ -134,6 +149,7 @@ class ScrollWindow(object):
         self.__full_surf = None
         self.__window_surf = None
         self.__view_surf = None
+        self.__chrome = None
 
 
 def main():
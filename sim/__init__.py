@@ -0,0 +1,7 @@
+from .timers import Timer, Scheduler
+from .player import Player, get_name
+from .state import WorldState
+from .history import ItemHistory
+from .tile import Tile
+from .island import Map
+from .world import World, get_map_cost
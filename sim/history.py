@@ -0,0 +1,125 @@
+import numpy as np
+
+# (seconds per bucket, buckets kept) for each resolution: a minute by the
+# second, an hour by the minute and two days by the hour
+HISTORY_TIERS = [(1, 60), (60, 60), (60*60, 48)]
+
+
+class RingBuffer(object):
+    # every sample is written twice, size apart, so the last size samples are
+    # always one contiguous slice of the array
+    def __init__(self, size):
+        self.size = size
+        self.data = np.zeros(2*size, np.int64)
+        self.start = 0
+        self.count = 0
+        self.__low = None
+        self.__high = None
+
+    def __len__(self):
+        return self.count
+
+    def append(self, value):
+        if self.count < self.size:
+            index = self.count
+            self.count += 1
+            dropped = None
+        else:
+            index = self.start
+            dropped = self.data[index]
+            self.start = (self.start + 1) % self.size
+        self.data[index] = value
+        self.data[index + self.size] = value
+        # the extremes only need a rescan when the one falling off the end was one
+        if self.__low is not None:
+            if dropped == self.__low and value > dropped:
+                self.__low = None
+            else:
+                self.__low = min(self.__low, value)
+        if self.__high is not None:
+            if dropped == self.__high and value < dropped:
+                self.__high = None
+            else:
+                self.__high = max(self.__high, value)
+
+    def replace_last(self, value):
+        index = (self.start + self.count - 1) % self.size
+        old = self.data[index]
+        self.data[index] = value
+        self.data[index + self.size] = value
+        if self.__low is not None:
+            if old == self.__low and value > old:
+                self.__low = None
+            else:
+                self.__low = min(self.__low, value)
+        if self.__high is not None:
+            if old == self.__high and value < old:
+                self.__high = None
+            else:
+                self.__high = max(self.__high, value)
+
+    def values(self):
+        # oldest first, a view rather than a copy
+        return self.data[self.start:self.start + self.count]
+
+    @property
+    def low(self):
+        if self.__low is None and self.count:
+            self.__low = int(self.values().min())
+        return self.__low
+
+    @property
+    def high(self):
+        if self.__high is None and self.count:
+            self.__high = int(self.values().max())
+        return self.__high
+
+
+class HistoryTier(object):
+    # each bucket keeps the lowest and highest value seen in it, so a spike or dip
+    # shorter than the bucket still shows; the newest bucket fills as samples come in
+    def __init__(self, period, size):
+        self.period = period
+        self.size = size
+        self.lows = RingBuffer(size)
+        self.highs = RingBuffer(size)
+        self.samples = 0
+
+    def __len__(self):
+        return len(self.highs)
+
+    def append(self, value, count=1):
+        # count samples of the same value, a bucket at a time
+        while count:
+            if self.samples == 0:
+                # buckets that would only be pushed out again are skipped
+                if count > self.period*self.size:
+                    count = self.period*self.size + count % self.period
+                self.lows.append(value)
+                self.highs.append(value)
+            else:
+                if value < self.lows.values()[-1]:
+                    self.lows.replace_last(value)
+                if value > self.highs.values()[-1]:
+                    self.highs.replace_last(value)
+            taken = min(count, self.period - self.samples)
+            self.samples = (self.samples + taken) % self.period
+            count -= taken
+
+    @property
+    def low(self):
+        return self.lows.low
+
+    @property
+    def high(self):
+        return self.highs.high
+
+
+class ItemHistory(object):
+    # one sample a second, folded into every tier
+    def __init__(self, tiers=HISTORY_TIERS):
+        self.tiers = [HistoryTier(period, size) for period, size in tiers]
+
+    def append(self, value, count=1):
+        for tier in self.tiers:
+            tier.append(value, count)
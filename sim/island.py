@@ -0,0 +1,111 @@
+from collections import defaultdict
+import numpy as np
+from .rules import *
+from .state import RESOURCE_IDS
+from .tile import Tile, SPAWN_TABLES
+
+
+class Map(object):
+    def __init__(self, tilemap, world, grid_pos):
+        self.world = world
+        self.grid_x, self.grid_y = grid_pos
+        self.index = (self.grid_y, self.grid_x)
+        self.rng = world.island_rng(grid_pos)
+        self.tiles = [[None]*MAP_SIZE for _ in range(MAP_SIZE)]
+        # tiles with a live timer
+        self.active_tiles = set()
+        # tiles changed since a view last picked them up
+        self.dirty = set()
+        self.version = 0
+        # kept up to date by Tile.resource, so spawning never has to scan the map
+        self.res_count = 0
+        self.free = []
+        self.free_pos = {}
+        # tiles by resource that a gatherer could still claim
+        self.targets = defaultdict(set)
+        self.available_workers = 0
+        self.max_power = 0
+        self.available_power = 0
+        for y, row in enumerate(tilemap):
+            for x, col in enumerate(row):
+                if col != '0':
+                    self.tiles[y][x] = Tile(x, y, self, col)
+        self.seed_resources(10)
+
+    @property
+    def scheduler(self):
+        return self.world.scheduler
+
+    @property
+    def beds(self):
+        return int(self.world.state.beds[self.index].sum())
+
+    @property
+    def population(self):
+        return int(self.world.state.population[self.index].sum())
+
+    def touch(self, tile):
+        self.dirty.add(tile)
+        self.version += 1
+
+    def recount(self, tile, old, new):
+        if old is not None:
+            self.targets[old].discard(tile)
+            self.res_count -= 1
+        if new is not None:
+            if tile.status != 'mined':
+                self.targets[new].add(tile)
+            self.res_count += 1
+            if tile in self.free_pos:
+                # swap the last free tile into the gap
+                i = self.free_pos.pop(tile)
+                last = self.free.pop()
+                if last is not tile:
+                    self.free[i] = last
+                    self.free_pos[last] = i
+        elif tile not in self.free_pos and TILE_INFO[tile.type]['can_spawn']:
+            self.free_pos[tile] = len(self.free)
+            self.free.append(tile)
+
+    def retarget(self, tile):
+        if tile.resource is not None:
+            if tile.status == 'mined':
+                self.targets[tile.resource].discard(tile)
+            else:
+                self.targets[tile.resource].add(tile)
+
+    def claim_target(self, gatherer):
+        # first tile in reach going row by row from the top, as the old square scan found it;
+        # it is taken out of the index so no other gatherer can pick it as well
+        best = None
+        radius = gatherer.work_radius
+        for res in gatherer.gathers:
+            for tile in self.targets[res]:
+                if abs(tile.grid_x - gatherer.grid_x) <= radius and abs(tile.grid_y - gatherer.grid_y) <= radius:
+                    if best is None or (tile.grid_y, tile.grid_x) < (best.grid_y, best.grid_x):
+                        best = tile
+        if best is not None:
+            self.targets[best.resource].discard(best)
+        return best
+
+    def seed_resources(self, count):
+        # a new island picks its tiles first, then draws what lands on them a terrain at a time
+        by_type = defaultdict(list)
+        for tile in self.rng.sample(self.free, min(count, 40 - self.res_count, len(self.free))):
+            by_type[tile.type].append(tile)
+        for tile_type, tiles in by_type.items():
+            for tile, res in zip(tiles, SPAWN_TABLES[tile_type].draw(self.rng, len(tiles))):
+                if res != 'none':
+                    tile.place(res)
+
+    def rand_spawn(self, count=1):
+        # one attempt after another, so a batch draws from the rng exactly as that
+        # many single spawns would
+        for _ in range(count):
+            if self.res_count >= 40 or not self.free:
+                break
+            self.free[self.rng.randrange(len(self.free))].spawn()
+
+    def resource_count(self):
+        counts = np.bincount(self.world.state.resource[self.index].ravel(), minlength=len(RESOURCE_IDS))
+        return {RESOURCE_IDS[code]: int(n) for code, n in enumerate(counts) if code and n}
@@ -0,0 +1,229 @@
+from collections import defaultdict
+from .rules import *
+
+# catch-up runs this much through the scheduler before switching to closed form,
+# which settles builds and mines that were under way when the game was saved
+EXACT_TICKS = 15*ONE_SEC
+# the closed form only notices upkeep running out between chunks, so a chunk is
+# also cut short where the first upkeep item would run out
+CHUNK_TICKS = 10*60*ONE_SEC
+
+
+def firings(deadline, period, end):
+    if deadline > end:
+        return 0
+    return (end - deadline)//period + 1
+
+
+def catch_up(world, ticks):
+    exact = min(ticks, EXACT_TICKS)
+    world.advance(exact)
+    if ticks > exact:
+        fast_forward(world, ticks - exact)
+
+
+def fast_forward(world, ticks):
+    scheduler = world.scheduler
+    end = scheduler.now + ticks
+
+    world.regen_energy(firings(world.regen_timer.deadline, world.regen_timer.ticks, end))
+    spawns = firings(world.spawn_timer.deadline, world.spawn_timer.ticks, end)
+
+    # spawning and gathering are worked out for the whole stretch up front and
+    # paid out chunk by chunk as long as the gatherers keep running
+    gathered = {}
+    for tile_map in world.iter_maps():
+        gatherers = []
+        for tile in list(tile_map.active_tiles):
+            if tile.status == 'mined':
+                tile.finish_mine()
+            elif tile.status == 'producing' and tile.gathers:
+                gatherers.append((tile, firings(tile.timer.deadline, tile.frequency, end)))
+        gathered[tile_map] = gather(tile_map, gatherers, spawns)
+    owed = defaultdict(float)
+
+    while scheduler.now < end:
+        stop = run_out(world, min(end, scheduler.now + CHUNK_TICKS))
+        run_chunk(world, stop, gathered, owed, float(stop - scheduler.now)/ticks)
+
+
+def run_out(world, stop):
+    # when an upkeep item runs short the chunk ends about where it runs out, so the
+    # buildings relying on workers or power from whatever stops stop with it; every
+    # consumer still gets to its next cycle, where the ones left short find out
+    now = world.scheduler.now
+    demand = defaultdict(int)
+    made = defaultdict(int)
+    due = {}
+    for tile_map in world.iter_maps():
+        for tile in tile_map.active_tiles:
+            if tile.status != 'producing':
+                continue
+            cycles = firings(tile.timer.deadline, tile.frequency, stop)
+            items = [key for key in tile.upkeep or {} if key not in ['workers', 'power']]
+            if items:
+                for key in items:
+                    demand[key] += tile.upkeep[key]*cycles
+                    if cycles:
+                        due[key] = max(due.get(key, now), tile.timer.deadline)
+            elif tile.produces:
+                for key, value in tile.produces.items():
+                    made[key] += value*cycles
+    for key, value in demand.items():
+        have = world.player.inventory[key] + made[key]
+        if value > have:
+            stop = min(stop, max(now + (stop - now)*max(0, have)//value, due[key]))
+    return stop
+
+
+def run_chunk(world, stop, gathered, owed, part):
+    scheduler = world.scheduler
+    player = world.player
+
+    producing = []
+    for tile_map in world.iter_maps():
+        gatherers = 0
+        running = 0
+        for tile in tile_map.active_tiles:
+            if tile.gathers:
+                gatherers += 1
+            if tile.status == 'producing':
+                producing.append((tile, firings(tile.timer.deadline, tile.frequency, stop)))
+                if tile.gathers:
+                    running += 1
+        if gatherers:
+            for key, value in gathered[tile_map].items():
+                owed[key] += value*part*running/gatherers
+    for key, value in owed.items():
+        if value >= 1:
+            owed[key] -= int(value)
+            for item, amt in player.buffedgives(key).items():
+                player.adjust_inventory(item, amt*int(value))
+
+    # buildings that only need workers and power run every cycle, the rest
+    # share out whatever their upkeep items allow
+    consumers = []
+    demand = defaultdict(int)
+    for tile, cycles in producing:
+        items = [key for key in tile.upkeep or {} if key not in ['workers', 'power']]
+        if items:
+            consumers.append((tile, cycles, items))
+            for key in items:
+                demand[key] += tile.upkeep[key]*cycles
+        elif tile.produces:
+            for key, value in tile.produces.items():
+                player.adjust_inventory(key, value*cycles)
+    share = {}
+    for key, value in demand.items():
+        if value:
+            share[key] = min(1.0, player.inventory[key]/float(value))
+        else:
+            share[key] = 1.0
+
+    stopped = []
+    for tile, cycles, items in consumers:
+        worked = int(cycles*min(share[key] for key in items))
+        for key in items:
+            player.adjust_inventory(key, -tile.upkeep[key]*worked)
+        if tile.produces:
+            for key, value in tile.produces.items():
+                player.adjust_inventory(key, value*worked)
+        if worked < cycles:
+            stopped.append(tile)
+
+    scheduler.skip(stop - scheduler.now)
+    for tile in stopped:
+        tile.stop_work()
+
+    # houses and generators that stopped take their workers and power with them,
+    # which stops whatever was relying on those, earliest due first
+    for tile_map in world.iter_maps():
+        if tile_map.available_workers >= 0 and tile_map.available_power >= 0:
+            continue
+        tiles = sorted((tile for tile in tile_map.active_tiles if tile.status == 'producing' and tile.upkeep),
+                       key=lambda tile: tile.timer.deadline)
+        for tile in tiles:
+            if ((tile_map.available_workers < 0 and 'workers' in tile.upkeep
+                 or tile_map.available_power < 0 and 'power' in tile.upkeep)):
+                tile.stop_work()
+            if tile_map.available_workers >= 0 and tile_map.available_power >= 0:
+                break
+
+    # and anything that can run again picks up where the next chunk starts
+    for tile_map in world.iter_maps():
+        for tile in list(tile_map.active_tiles):
+            if tile.status == 'not producing' and tile.can_work():
+                tile.begin_work()
+
+
+def gather(tile_map, gatherers, spawns):
+    if not gatherers:
+        tile_map.rand_spawn(spawns)
+        return {}
+
+    # resources some gatherer picks up on each tile it can reach
+    reach = defaultdict(set)
+    for tile, cycles in gatherers:
+        radius = tile.work_radius
+        for y in range(max(0, tile.grid_y-radius), min(MAP_SIZE, tile.grid_y+radius+1)):
+            for x in range(max(0, tile.grid_x-radius), min(MAP_SIZE, tile.grid_x+radius+1)):
+                reach[(x, y)].update(tile.gathers)
+
+    gathered = defaultdict(float)
+    for (x, y), res_set in reach.items():
+        tile = tile_map.tiles[y][x]
+        if tile.resource in res_set and tile.status is None:
+            gathered[tile.resource] += 1
+            tile.clear()
+
+    # a spawn on an empty tile is either picked up, does nothing, or sticks;
+    # between two that stick the odds stay the same, so the pickups in between
+    # are added up in one go rather than rolled one by one
+    empty = {}
+    caught_total = defaultdict(float)
+    stay_total = 0.0
+    for tile in tile_map.free:
+        weights = TILE_INFO[tile.type]['can_spawn']
+        total = float(sum(weights.values()))
+        caught = {}
+        stays = {}
+        for key, value in weights.items():
+            if key in reach.get((tile.grid_x, tile.grid_y), ()):
+                caught[key] = value/total
+                caught_total[key] += value/total
+            elif key != 'none':
+                stays[key] = value/total
+                stay_total += value/total
+        empty[tile] = (caught, stays)
+
+    left = float(spawns)
+    while left > 0 and tile_map.res_count < 40 and empty:
+        size = float(len(empty))
+        if stay_total <= 0 or left < size/stay_total:
+            for key, value in caught_total.items():
+                gathered[key] += left*value/size
+            break
+        for key, value in caught_total.items():
+            gathered[key] += value/stay_total
+        left -= size/stay_total
+
+        pick = tile_map.rng.random()*stay_total
+        for tile, (caught, stays) in empty.items():
+            if stays:
+                last = tile
+                pick -= sum(stays.values())
+                if pick < 0:
+                    break
+        tile = last
+        caught, stays = empty.pop(tile)
+        for key, value in caught.items():
+            caught_total[key] -= value
+        stay_total -= sum(stays.values())
+        tile.place(tile_map.rng.choices(list(stays), list(stays.values()))[0])
+
+    capacity = sum(cycles for tile, cycles in gatherers)
+    total = sum(gathered.values())
+    if total > capacity:
+        for key in gathered:
+            gathered[key] *= capacity/total
+    return {key: int(round(value)) for key, value in gathered.items()}
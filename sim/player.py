@@ -0,0 +1,168 @@
+from collections import deque
+from .rules import *
+
+LOG_LENGTH = 5
+
+
+def get_name(item, num, cap):
+    if num == 1 or num == -1:
+        if cap:
+            return ITEMS[item]['i_cap']
+        else:
+            return ITEMS[item]['lower']
+    else:
+        if cap:
+            return ITEMS[item]['plural_i_cap']
+        else:
+            return ITEMS[item]['plural']
+
+
+class Player(object):
+    def __init__(self):
+        self.max_energy = 100
+        self.inventory = {'energy': 0,
+                          'coins': 0,
+                          'wood': 0,
+                          'stick': 0,
+                          'sand': 0,
+                          'stone': 0,
+                          'food': 0,
+                          'ironore': 0,
+                          'iron': 0,
+                          'glass': 0,
+                          'goldore': 0,
+                          'gold': 0,
+                          'gem': 0}
+        self.population = 0
+        self.known_items = []
+        self.recipes = {}
+        self.free_crafting = False
+        self.buildables = {}
+        self.free_building = False
+        self.can_buy = False
+        self.perks = []
+        self.usables = {'food': {'gives': {'energy': 20},
+                                 'costs': {'food': 1}}}
+        self.rates = {}
+        # dropbuffs = {'res': {'gives':{'thing': 0}...,'minecosts': {'thing': 0}}...}
+        self.dropbuffs = {}
+        for key1 in RESOURCES:
+            self.dropbuffs[key1] = {'minegives': {}, 'minecosts': {}}
+            for key2 in RESOURCES[key1]['minegives']:
+                self.dropbuffs[key1]['minegives'][key2] = 0
+            for key2 in RESOURCES[key1]['minecosts']:
+                self.dropbuffs[key1]['minecosts'][key2] = 0
+        # log lines waiting to be picked up by whoever is watching the game
+        self.messages = deque(maxlen=LOG_LENGTH)
+        # bumped whenever inventory or knowledge changes, so views know to rebuild
+        self.version = 0
+
+    def notify(self, text):
+        self.messages.append(text)
+
+    def get_perk(self, perk_id):
+        self.version += 1
+        perk = PERKS[perk_id]
+        if 'knowledge' in perk:
+            if 'recipes' in perk['knowledge']:
+                for recipe in perk['knowledge']['recipes']:
+                    self.learn_recipe(recipe)
+            if 'buildings' in perk['knowledge']:
+                for building in perk['knowledge']['buildings']:
+                    self.learn_building(building)
+        if 'bonuses' in perk:
+            mine_gives = perk['bonuses'].get('minegives', None)
+            mine_time = perk['bonuses'].get('minetime', None)
+            if mine_gives is not None:
+                for bonus in mine_gives:
+                    for thing in mine_gives[bonus]:
+                        self.dropbuffs[bonus]['minegives'][thing] += mine_gives[bonus][thing]
+
+            if mine_time is not None:
+                for bonus in mine_time:
+                    if bonus not in self.rates:
+                        self.rates[bonus] = mine_time[bonus]
+                    else:
+                        self.rates[bonus] = self.rates[bonus]*mine_time[bonus]
+            if 'free crafting' in perk['bonuses']:
+                self.free_crafting = True
+            if 'free building' in perk['bonuses']:
+                self.free_building = True
+            if 'buying' in perk['bonuses']:
+                self.can_buy = True
+
+    def buffedgives(self, res):
+        gives = {}
+        for key, value in RESOURCES[res]['minegives'].items():
+            gives[key] = int(value*(1+self.dropbuffs[res]['minegives'][key]))
+        return gives
+
+    def mine_ticks(self, res):
+        if res in self.rates:
+            rate = self.rates[res]
+        else:
+            rate = 1
+        return int(RESOURCES[res]['minetime']*rate)
+
+    def learn_recipe(self, thing):
+        self.version += 1
+        self.recipes[thing] = ALL_RECIPES[thing]
+
+    def learn_building(self, thing):
+        self.version += 1
+        self.buildables[thing] = BUILDABLES[thing]
+
+    def adjust_inventory(self, item, amt):
+        self.version += 1
+        if item == 'energy':
+            new_amt = min(self.max_energy, self.inventory['energy'] + amt)
+            self.inventory['energy'] = new_amt
+        else:
+            if item not in self.known_items:
+                self.known_items.append(item)
+            self.inventory[item] += amt
+            if self.inventory[item] < 0:
+                self.inventory[item] = 0
+                return 'failed'
+
+    def craftable(self, item, number=1):
+        is_craftable = True
+        for key, value in self.recipes[item]['costs'].items():
+            if self.inventory[key] < value*number:
+                if key != 'energy' or self.free_crafting is False:
+                    is_craftable = False
+        return is_craftable
+
+    def buildable(self, item):
+        is_buildable = True
+        for key, value in self.buildables[item]['buildcosts'].items():
+            if self.inventory[key] < value:
+                if key != 'energy' or self.free_building is False:
+                    is_buildable = False
+        return is_buildable
+
+    def usable(self, item, number=1):
+        is_usable = True
+        for key, value in self.usables[item]['costs'].items():
+            if self.inventory[key] < value*number:
+                is_usable = False
+        return is_usable
+
+    def craft(self, item, number=1):
+        if self.craftable(item, number):
+            for key, value in self.recipes[item]['costs'].items():
+                if key != 'energy' or self.free_crafting is False:
+                    self.adjust_inventory(key, -value*number)
+            for key, value in self.recipes[item]['gives'].items():
+                self.adjust_inventory(key, value*number)
+                text = '{:,}'.format(value*number)+' '+get_name(key, value*number, False)+' crafted'
+                self.notify(text)
+
+    def use(self, item, number=1):
+        if self.usable(item, number):
+            for key, value in self.usables[item]['costs'].items():
+                self.adjust_inventory(key, -value*number)
+            for key, value in self.usables[item]['gives'].items():
+                self.adjust_inventory(key, value*number)
+                text = '{:,}'.format(number)+' '+get_name(item, number, False)+' used'
+                self.notify(text)
@@ -0,0 +1,21 @@
+import numpy as np
+from .rules import *
+
+# codes stored in the arrays, 0 always means nothing there
+TERRAINS = [None] + list(TILE_INFO)
+RESOURCE_IDS = [None] + list(RESOURCES)
+STATUSES = [None, 'building', 'starting production', 'producing', 'not producing', 'disabled', 'mined']
+TERRAIN_CODES = {key: i for i, key in enumerate(TERRAINS)}
+RESOURCE_CODES = {key: i for i, key in enumerate(RESOURCE_IDS)}
+STATUS_CODES = {key: i for i, key in enumerate(STATUSES)}
+
+
+class WorldState(object):
+    # every tile of every island, indexed (map_y, map_x, tile_y, tile_x)
+    def __init__(self, size=MAP_SIZE):
+        shape = (size, size, MAP_SIZE, MAP_SIZE)
+        self.terrain = np.zeros(shape, np.int8)
+        self.resource = np.zeros(shape, np.int8)
+        self.status = np.zeros(shape, np.int8)
+        self.population = np.zeros(shape, np.int16)
+        self.beds = np.zeros(shape, np.int16)
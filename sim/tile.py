@@ -0,0 +1,341 @@
+from itertools import accumulate
+from .rules import *
+from .player import get_name
+from .timers import Timer
+from .state import *
+
+
+class SpawnTable(object):
+    def __init__(self, weights):
+        self.keys = list(weights)
+        self.cum_weights = list(accumulate(weights.values()))
+
+    def draw(self, rng, k=1):
+        return rng.choices(self.keys, cum_weights=self.cum_weights, k=k)
+
+
+# built once per terrain rather than expanded into a list on every spawn
+SPAWN_TABLES = {key: SpawnTable(info['can_spawn']) for key, info in TILE_INFO.items() if info['can_spawn']}
+
+
+class Tile(object):
+    # fields are read from the tile itself; terrain, resource, status, population and
+    # beds are also written through to the world's arrays, which the island sums and
+    # counts read in one go
+    __slots__ = ['grid_x', 'grid_y', 'map', 'state', 'index', 'type', 'mine_costs', 'max_power', 'recruit_cost',
+                 'produces', 'gathers', 'frequency', 'upkeep', 'work_radius', 'timer',
+                 '__resource', '__status', '__population', '__beds']
+
+    def __init__(self, x, y, owner_map, tile_type='g'):
+        self.grid_x = x
+        self.grid_y = y
+        self.map = owner_map
+        self.state = owner_map.world.state
+        self.index = (owner_map.grid_y, owner_map.grid_x, y, x)
+        self.type = tile_type
+        self.state.terrain[self.index] = TERRAIN_CODES[tile_type]
+        self.__resource = None
+        self.__status = None
+        self.resource = None
+        self.mine_costs = None
+        self.beds = 0
+        self.population = 0
+        self.max_power = 0
+        self.recruit_cost = 0
+        self.produces = None
+        self.gathers = None
+        self.frequency = None
+        self.upkeep = None
+        self.work_radius = None
+        self.status = None
+        self.timer = None
+
+    @property
+    def resource(self):
+        return self.__resource
+
+    @resource.setter
+    def resource(self, value):
+        old = self.__resource
+        self.__resource = value
+        self.state.resource[self.index] = RESOURCE_CODES[value]
+        self.map.recount(self, old, value)
+
+    @property
+    def status(self):
+        return self.__status
+
+    @status.setter
+    def status(self, value):
+        old = self.__status
+        self.__status = value
+        self.state.status[self.index] = STATUS_CODES[value]
+        if old == 'mined' or value == 'mined':
+            self.map.retarget(self)
+
+    @property
+    def population(self):
+        return self.__population
+
+    @population.setter
+    def population(self, value):
+        self.__population = value
+        self.state.population[self.index] = value
+
+    @property
+    def beds(self):
+        return self.__beds
+
+    @beds.setter
+    def beds(self, value):
+        self.__beds = value
+        self.state.beds[self.index] = value
+
+    @property
+    def player(self):
+        return self.map.world.player
+
+    @property
+    def resource_dict(self):
+        return RESOURCES[self.resource]
+
+    @property
+    def progress(self):
+        # percentage shown on the build/mine overlay, None when there is none
+        if self.timer is None or self.status not in ['mined', 'building']:
+            return None
+        num = 100-100*self.timer.value/float(self.timer.ticks)
+        if self.status == 'building':
+            return 100-num
+        return num
+
+    def touch(self):
+        self.map.touch(self)
+
+    def set_timer(self, ticks, action):
+        self.clear_timer()
+        self.timer = self.map.scheduler.add(Timer(ticks, action, {}))
+        self.update_active()
+
+    def clear_timer(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        self.update_active()
+
+    def update_active(self):
+        if self.timer is not None:
+            self.map.active_tiles.add(self)
+        else:
+            self.map.active_tiles.discard(self)
+
+    def spawn(self, force=False):
+        if self.type in SPAWN_TABLES or force:
+            res = SPAWN_TABLES[self.type].draw(self.map.rng)[0]
+            if res != 'none':
+                self.place(res)
+
+    def place(self, res):
+        self.resource = res
+        self.mine_costs = self.resource_dict['minecosts']
+        self.touch()
+
+    def begin_build(self, res):
+        self.resource = res
+        self.mine_costs = self.resource_dict['minecosts']
+        self.produces = self.resource_dict.get('produces', None)
+        self.gathers = self.resource_dict.get('gathers', None)
+        self.frequency = self.resource_dict.get('frequency', None)
+        self.upkeep = self.resource_dict.get('upkeep', None)
+        self.work_radius = self.resource_dict.get('workradius', None)
+        for key, value in BUILDABLES[res]['buildcosts'].items():
+            if key != 'energy' or self.player.free_building is False:
+                self.player.adjust_inventory(key, -value)
+        self.status = 'building'
+        self.set_timer(BUILDABLES[res]['buildtime'], self.finish_build)
+        self.touch()
+
+    def finish_build(self):
+        self.beds += self.resource_dict.get('beds', 0)
+        if 'powerproduced' in self.resource_dict:
+            self.max_power = self.resource_dict['powerproduced']
+            self.map.max_power += self.max_power
+
+        self.recruit_cost = self.resource_dict.get('recruitcost', 0)
+        if self.produces or self.gathers or self.upkeep:
+            self.set_timer(ONE_SEC, self.begin_work)
+            self.status = 'starting production'
+        else:
+            self.clear_timer()
+            self.status = None
+        self.touch()
+
+    def begin_work(self):
+        if self.upkeep is None or self.can_work():
+            if self.status in ['not producing', 'disabled', 'starting production']:
+                if self.population > 0:
+                    self.map.available_workers += self.population
+                if self.max_power > 0:
+                    self.map.available_power += self.max_power
+
+            if self.upkeep:
+                for key, value in self.upkeep.items():
+                    if key == 'workers':
+                        self.map.available_workers -= value
+                    elif key == 'power':
+                        self.map.available_power -= value
+                    else:
+                        self.player.adjust_inventory(key, -value)
+            self.set_timer(self.frequency, self.finish_work)
+            self.status = 'producing'
+        else:
+            if self.status == 'producing':
+                self.map.available_workers -= self.population
+                self.map.available_power -= self.max_power
+            self.set_timer(self.frequency, self.begin_work)
+            self.status = 'not producing'
+        self.touch()
+
+    def finish_work(self):
+        if self.upkeep:
+            if 'workers' in self.upkeep:
+                self.map.available_workers += self.upkeep['workers']
+            if 'power' in self.upkeep:
+                self.map.available_power += self.upkeep['power']
+        if self.upkeep is None or self.can_work():
+            self.status = 'producing'
+            if self.produces:
+                for key, value in self.produces.items():
+                    self.player.adjust_inventory(key, value)
+
+            worked = False
+            if self.gathers:
+                target = self.map.claim_target(self)
+                if target is not None:
+                    worked = target.resource
+                    target.begin_mine(manual=False)
+
+            if self.upkeep:
+                for key, value in self.upkeep.items():
+                    if key == 'workers':
+                        self.map.available_workers -= self.upkeep['workers']
+                    elif key == 'power':
+                        self.map.available_power -= self.upkeep['power']
+                    else:
+                        self.player.adjust_inventory(key, -value)
+            ticks = self.frequency
+            if worked:
+                ticks = self.player.mine_ticks(worked)
+            self.set_timer(ticks, self.finish_work)
+        else:
+            if self.status == 'producing':
+                self.map.available_workers -= self.population
+                self.map.available_power -= self.max_power
+            self.set_timer(self.frequency, self.begin_work)
+            self.status = 'not producing'
+        self.touch()
+
+    def stop_work(self):
+        # for a building that ran out of upkeep in cycles that were never simulated
+        if self.upkeep:
+            self.map.available_workers += self.upkeep.get('workers', 0)
+            self.map.available_power += self.upkeep.get('power', 0)
+        self.map.available_workers -= self.population
+        self.map.available_power -= self.max_power
+        self.set_timer(self.frequency, self.begin_work)
+        self.status = 'not producing'
+        self.touch()
+
+    def can_work(self):
+        will_work = True
+        if self.upkeep:
+            for key, value in self.upkeep.items():
+                if key == 'workers':
+                    if self.map.available_workers < value:
+                        will_work = False
+                elif key == 'power':
+                    if self.map.available_power < value:
+                        will_work = False
+                else:
+                    if self.player.inventory[key] < value:
+                        will_work = False
+        return will_work
+
+    def minable(self):
+        is_minable = True
+        if self.mine_costs:
+            for key, value in self.mine_costs.items():
+                if self.player.inventory[key] < value:
+                    is_minable = False
+        return is_minable
+
+    def can_recruit(self):
+        return (self.beds > self.population
+                and self.resource_dict.get('recruitcost', 0) <= self.player.inventory['coins'])
+
+    def recruit(self):
+        if self.can_recruit():
+            if self.status == 'producing':
+                self.map.available_workers += 1
+            self.population += 1
+            self.player.adjust_inventory('coins', -self.resource_dict.get('recruitcost', 0))
+            self.touch()
+
+    def begin_mine(self, manual=True):
+        if self.beds > 0:
+            self.beds = 0
+            self.recruit_cost = 0
+        if self.status == 'producing':
+            if self.upkeep:
+                self.map.available_workers += self.upkeep.get('workers', 0)
+                self.map.available_power += self.upkeep.get('power', 0)
+            self.map.available_workers -= self.population
+            if self.max_power > 0:
+                self.map.max_power -= self.max_power
+                self.map.available_power -= self.max_power
+                self.max_power = 0
+
+        self.population = 0
+        if not manual or self.minable():
+            self.status = 'mined'
+            if manual:
+                for key, value in self.mine_costs.items():
+                    self.player.adjust_inventory(key, -value)
+            self.set_timer(self.player.mine_ticks(self.resource), self.finish_mine)
+            self.touch()
+
+    def finish_mine(self):
+        for key, value in self.player.buffedgives(self.resource).items():
+            self.player.adjust_inventory(key, value)
+            text = '{:,}'.format(value)+' '+get_name(key, value, False)+' added'
+            self.player.notify(text)
+        self.clear()
+
+    def clear(self):
+        self.resource = None
+        self.mine_costs = None
+        self.produces = None
+        self.gathers = None
+        self.frequency = None
+        self.upkeep = None
+        self.work_radius = None
+        self.status = None
+        self.clear_timer()
+        self.touch()
+
+    def disable(self):
+        if self.status == 'producing':
+            if self.upkeep:
+                self.map.available_workers += self.upkeep.get('workers', 0)
+                self.map.available_power += self.upkeep.get('power', 0)
+            self.map.available_workers -= self.population
+            self.map.available_power -= self.max_power
+
+        self.status = 'disabled'
+        self.clear_timer()
+        self.touch()
+
+    def enable(self):
+        self.set_timer(self.frequency, self.begin_work)
+        self.status = 'not producing'
+        self.touch()
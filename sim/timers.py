@@ -0,0 +1,105 @@
+import heapq
+
+
+class Timer(object):
+    def __init__(self, ticks, action, kwargs, repeat=False):
+        self.ticks = ticks
+        self.action = action
+        self.kwargs = kwargs
+        self.repeat = repeat
+        self.done = False
+        self.deadline = None
+        self.scheduler = None
+
+    @property
+    def value(self):
+        # ticks remaining until the action fires
+        if self.scheduler is None:
+            return self.ticks
+        return self.deadline - self.scheduler.now
+
+    def cancel(self):
+        self.done = True
+
+
+class Scheduler(object):
+    def __init__(self):
+        self.now = 0
+        self.queue = []
+        self.counter = 0
+        # repeating timers whose action takes a count and can be applied in bulk
+        self.periodic = []
+
+    def add(self, timer):
+        timer.scheduler = self
+        timer.deadline = self.now + timer.ticks
+        timer.done = False
+        # the counter breaks deadline ties so timers fire in the order they were added
+        self.counter += 1
+        heapq.heappush(self.queue, (timer.deadline, self.counter, timer))
+        return timer
+
+    def add_periodic(self, timer):
+        timer.scheduler = self
+        timer.deadline = self.now + timer.ticks
+        timer.repeat = True
+        self.periodic.append(timer)
+        return timer
+
+    def __len__(self):
+        return len(self.queue) + len(self.periodic)
+
+    def next_deadline(self):
+        queue = self.queue
+        while queue and queue[0][2].done:
+            heapq.heappop(queue)
+        if queue:
+            return queue[0][0]
+        return None
+
+    def tick(self):
+        self.advance(1)
+
+    def advance(self, ticks):
+        end = self.now + ticks
+        queue = self.queue
+        while True:
+            stop = self.next_deadline()
+            if stop is None or stop > end:
+                stop = end
+            self.now = stop
+            # periodic timers only touch state nothing else reads in between, so
+            # every firing up to the next queued deadline is applied in one call
+            for timer in self.periodic:
+                if timer.deadline <= stop:
+                    count = (stop - timer.deadline)//timer.ticks + 1
+                    timer.deadline += count*timer.ticks
+                    timer.action(count=count, **timer.kwargs)
+            while queue and queue[0][0] <= stop:
+                timer = heapq.heappop(queue)[2]
+                if timer.done:
+                    continue
+                timer.action(**timer.kwargs)
+                if timer.repeat:
+                    if not timer.done:
+                        self.add(timer)
+                else:
+                    timer.done = True
+            if stop == end:
+                break
+
+    def skip(self, ticks):
+        # moves the clock on without firing anything, the caller accounts for what
+        # the skipped firings would have done; overdue timers keep their phase
+        self.now += ticks
+        for timer in self.periodic:
+            if timer.deadline <= self.now:
+                timer.deadline += ((self.now - timer.deadline)//timer.ticks + 1)*timer.ticks
+        queue = []
+        for deadline, counter, timer in self.queue:
+            if not timer.done:
+                if timer.deadline <= self.now:
+                    timer.deadline += ((self.now - timer.deadline)//timer.ticks + 1)*timer.ticks
+                queue.append((timer.deadline, counter, timer))
+        heapq.heapify(queue)
+        self.queue = queue
@@ -0,0 +1,142 @@
+import random
+from . import tilemaps
+from .rules import *
+from .island import Map
+from .offline import catch_up
+from .player import Player
+from .state import WorldState
+from .timers import Scheduler, Timer
+
+
+def get_map_cost(grid_pos):
+    if 0 <= grid_pos[0] < MAP_SIZE and 0 <= grid_pos[1] < MAP_SIZE:
+        x = abs(grid_pos[0]-4)
+        y = abs(grid_pos[1]-4)
+        radius = max(x, y)
+        cost = MAP_COSTS[radius]
+        return cost
+    else:
+        return 0
+
+
+class World(object):
+    def __init__(self, cheats=False, seed=None):
+        self.cheats = cheats
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.player = Player()
+        self.scheduler = Scheduler()
+
+        self.player.learn_recipe('stick')
+        self.player.learn_building('animal trap')
+        self.player.adjust_inventory('energy', 100)
+        if cheats:
+            self.player.adjust_inventory('wood', 100000)
+            self.player.adjust_inventory('stick', 100000)
+            self.player.adjust_inventory('stone', 100000)
+            self.player.adjust_inventory('sand', 100000)
+            self.player.adjust_inventory('glass', 100000)
+            self.player.adjust_inventory('ironore', 100000)
+            self.player.adjust_inventory('goldore', 100000)
+            self.player.adjust_inventory('iron', 100000)
+            self.player.adjust_inventory('gold', 100000)
+            self.player.adjust_inventory('food', 100000)
+            self.player.adjust_inventory('coins', 100000)
+
+        self.state = WorldState()
+        self.maps = [[None]*MAP_SIZE for _ in range(MAP_SIZE)]
+        # grid positions of maps that can be bought, and what they cost
+        self.map_costs = {(4, 4): 0}
+        self.last_map = {1: None, 2: None}
+        self.buy_map((4, 4))
+
+        self.regen_timer = self.scheduler.add_periodic(Timer(5*ONE_SEC, self.regen_energy, {}))
+        self.spawn_timer = self.scheduler.add_periodic(Timer(5*ONE_SEC, self.all_maps_spawn, {}))
+
+    @property
+    def now(self):
+        return self.scheduler.now
+
+    def tick(self):
+        self.scheduler.tick()
+
+    def advance(self, ticks):
+        self.scheduler.advance(ticks)
+
+    def catch_up(self, ticks):
+        # time passed while the game was closed, in bulk rather than tick for tick
+        catch_up(self, ticks)
+
+    def island_rng(self, grid_pos):
+        # islands draw from their own streams so one island's spawns don't shift another's
+        if self.seed is None:
+            return random.Random()
+        return random.Random('{}:{}:{}'.format(self.seed, grid_pos[0], grid_pos[1]))
+
+    def iter_maps(self):
+        for row in self.maps:
+            for my_map in row:
+                if my_map is not None:
+                    yield my_map
+
+    def regen_energy(self, count=1):
+        if not self.cheats:
+            self.player.adjust_inventory('energy', count)
+        else:
+            self.player.adjust_inventory('energy', 100*count)
+
+    def all_maps_spawn(self, count=1):
+        for my_map in self.iter_maps():
+            my_map.rand_spawn(count)
+
+    def buy_map(self, grid_pos):
+        x = abs(grid_pos[0] - 4)
+        y = abs(grid_pos[1] - 4)
+        radius = max(x, y)
+        adjacent_maps = [(-1, 0), (0, -1), (1, 0), (0, 1)]
+        if grid_pos in self.map_costs:
+            self.player.adjust_inventory('coins', -self.map_costs.pop(grid_pos))
+            if radius == 0:
+                tilemap = tilemaps.tilemap1
+            elif radius == 1:
+                while True:
+                    tilemap = self.rng.choice([tilemaps.tilemap2, tilemaps.tilemap3, tilemaps.tilemap4])
+                    if self.last_map[1] != tilemap:
+                        self.last_map[1] = tilemap
+                        break
+            elif radius == 2:
+                while True:
+                    tilemap = self.rng.choice([tilemaps.tilemap5, tilemaps.tilemap6, tilemaps.tilemap7])
+                    if self.last_map[2] != tilemap:
+                        self.last_map[2] = tilemap
+                        break
+            elif radius == 3:
+                if grid_pos[0] == 1:
+                    if grid_pos[1] == 1:
+                        tilemap = tilemaps.tilemap15
+                    elif grid_pos[1] == 7:
+                        tilemap = tilemaps.tilemap14
+                    else:
+                        tilemap = tilemaps.tilemap11
+                elif grid_pos[0] == 7:
+                    if grid_pos[1] == 1:
+                        tilemap = tilemaps.tilemap12
+                    elif grid_pos[1] == 7:
+                        tilemap = tilemaps.tilemap13
+                    else:
+                        tilemap = tilemaps.tilemap9
+                else:
+                    if grid_pos[1] == 1:
+                        tilemap = tilemaps.tilemap8
+                    elif grid_pos[1] == 7:
+                        tilemap = tilemaps.tilemap10
+            else:
+                tilemap = tilemaps.tilemap16
+
+            self.maps[grid_pos[1]][grid_pos[0]] = Map(tilemap, self, grid_pos)
+            for rel_pos in adjacent_maps:
+                pos = (grid_pos[0]+rel_pos[0], grid_pos[1]+rel_pos[1])
+                if ((0 <= pos[0] < MAP_SIZE and 0 <= pos[1] < MAP_SIZE
+                     and self.maps[pos[1]][pos[0]] is None and pos not in self.map_costs)):
+                    self.map_costs[pos] = get_map_cost(pos)
+            return self.maps[grid_pos[1]][grid_pos[0]]
@@ -4,6 +4,9 @@ white = (255, 255, 255)
 black = (0, 0, 0)
 green = (0, 100, 0)
 
+# drawn frames shared by every square, keyed by size, colour, alpha and whole percent
+frames = {}
+
 
 class StatusSquare(object):
     def __init__(self, w, h, color, perc=0.0, alpha=150):
@@ -13,50 +16,53 @@ class StatusSquare(object):
         self.color = color
         self.value = perc
         self.alpha = alpha
-        self.__surf = None
+
+    @property
+    def key(self):
+        return self.w, self.h, tuple(self.color), self.alpha, int(self.value)
 
     @property
     def surf(self):
-        if self.__surf is None:
-            self.__surf = pygame.Surface((self.w, self.h))
-            self.__surf.set_colorkey(black)
-            self.__surf.set_alpha(self.alpha)
-        return self.__surf
+        key = self.key
+        if key not in frames:
+            frames[key] = self.make_frame(key[-1])
+        return frames[key]
 
     def increment(self, inc):
         amt = min(100, max(0, self.value + inc))
         self.value = amt
-        self.draw()
 
     def set(self, num):
         amt = min(100, max(0, num))
         self.value = amt
-        self.draw()
 
     def draw(self):
+        return self.surf
+
+    def make_frame(self, value):
         pointlist = []
         pointlist.append(self.rect.midtop)
         pointlist.append(self.rect.center)
-        if self.value < 12.5:
-            xval = self.value/12.5*(self.w/2)+self.w/2
+        if value < 12.5:
+            xval = value/12.5*(self.w/2)+self.w/2
             pointlist.append((xval, 0))
-        elif self.value < 37.5:
-            yval = (self.value - 12.5)/25*self.h
+        elif value < 37.5:
+            yval = (value - 12.5)/25*self.h
             pointlist.append((self.w, yval))
             pointlist.append(self.rect.topright)
-        elif self.value < 62.5:
-            xval = self.w - (self.value - 37.5)/25*self.w
+        elif value < 62.5:
+            xval = self.w - (value - 37.5)/25*self.w
             pointlist.append((xval, self.h))
             pointlist.append(self.rect.bottomright)
             pointlist.append(self.rect.topright)
-        elif self.value < 87.5:
-            yval = self.h - (self.value - 62.5)/25*self.h
+        elif value < 87.5:
+            yval = self.h - (value - 62.5)/25*self.h
             pointlist.append((0, yval))
             pointlist.append(self.rect.bottomleft)
             pointlist.append(self.rect.bottomright)
             pointlist.append(self.rect.topright)
-        elif self.value < 100:
-            xval = (self.value - 87.5)/12.5*(self.w/2)
+        elif value < 100:
+            xval = (value - 87.5)/12.5*(self.w/2)
             pointlist.append((xval, 0))
             pointlist.append(self.rect.topleft)
             pointlist.append(self.rect.bottomleft)
@@ -64,11 +70,12 @@ class StatusSquare(object):
             pointlist.append(self.rect.topright)
         else:
             pointlist = [(0, 0), (self.w, 0), (self.w, self.h), (0, self.h)]
-        self.surf.fill(black)
-        pygame.draw.polygon(self.surf, self.color, pointlist)
-
-    def clean(self):
-        self.__surf = None
+        surf = pygame.Surface((self.w, self.h))
+        surf.set_colorkey(black)
+        surf.set_alpha(self.alpha)
+        surf.fill(black)
+        pygame.draw.polygon(surf, self.color, pointlist)
+        return surf
 
 
 def main():
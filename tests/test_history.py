@@ -0,0 +1,104 @@
+import random
+from sim.history import RingBuffer, HistoryTier, ItemHistory
+
+
+def test_ring_buffer_wraps_oldest_first():
+    ring = RingBuffer(3)
+    for value in [1, 2]:
+        ring.append(value)
+    assert list(ring.values()) == [1, 2]
+    for value in [3, 4, 5]:
+        ring.append(value)
+    assert len(ring) == 3
+    assert list(ring.values()) == [3, 4, 5]
+
+
+def test_ring_buffer_rescans_extremes_that_fall_off():
+    ring = RingBuffer(3)
+    for value in [9, 1, 5]:
+        ring.append(value)
+    assert (ring.low, ring.high) == (1, 9)
+    ring.append(4)
+    assert (ring.low, ring.high) == (1, 5)
+    ring.append(6)
+    ring.append(7)
+    assert (ring.low, ring.high) == (4, 7)
+
+
+def test_ring_buffer_replace_last():
+    ring = RingBuffer(3)
+    for value in [2, 8, 5]:
+        ring.append(value)
+    assert (ring.low, ring.high) == (2, 8)
+    ring.replace_last(0)
+    assert list(ring.values()) == [2, 8, 0]
+    assert (ring.low, ring.high) == (0, 8)
+    ring.append(3)
+    ring.replace_last(1)
+    assert list(ring.values()) == [8, 0, 1]
+    assert (ring.low, ring.high) == (0, 8)
+    ring.append(4)
+    ring.append(4)
+    ring.replace_last(2)
+    assert list(ring.values()) == [1, 4, 2]
+    assert (ring.low, ring.high) == (1, 4)
+
+
+def test_ring_buffer_matches_list():
+    rng = random.Random(3)
+    for size in [1, 5, 60]:
+        ring = RingBuffer(size)
+        ref = []
+        for _ in range(2000):
+            value = rng.randint(-50, 1000)
+            if ref and rng.random() < 0.3:
+                ring.replace_last(value)
+                ref[-1] = value
+            else:
+                ring.append(value)
+                ref = (ref + [value])[-size:]
+            assert list(ring.values()) == ref
+            assert (ring.low, ring.high) == (min(ref), max(ref))
+
+
+def test_tier_keeps_low_and_high_per_bucket():
+    tier = HistoryTier(3, 2)
+    for value in [5, 1, 7, 4, 4, 9, 2]:
+        tier.append(value)
+    # buckets [5, 1, 7], [4, 4, 9] and the open [2]; only the last two are kept
+    assert list(tier.lows.values()) == [4, 2]
+    assert list(tier.highs.values()) == [9, 2]
+    assert (tier.low, tier.high) == (2, 9)
+    tier.append(0)
+    tier.append(8)
+    assert list(tier.lows.values()) == [4, 0]
+    assert list(tier.highs.values()) == [9, 8]
+
+
+def test_item_history_tiers():
+    history = ItemHistory([(1, 4), (2, 3), (4, 2)])
+    for value in range(10):
+        history.append(value)
+    assert [list(tier.highs.values()) for tier in history.tiers] == [[6, 7, 8, 9], [5, 7, 9], [7, 9]]
+    assert [list(tier.lows.values()) for tier in history.tiers] == [[6, 7, 8, 9], [4, 6, 8], [4, 8]]
+
+
+def test_append_count_matches_repeated_appends():
+    rng = random.Random(5)
+    tiers = [(1, 4), (3, 3), (7, 2)]
+    for _ in range(200):
+        batched = ItemHistory(tiers)
+        single = ItemHistory(tiers)
+        for _ in range(rng.randint(0, 30)):
+            value = rng.randint(0, 9)
+            batched.append(value)
+            single.append(value)
+        value = rng.randint(0, 9)
+        count = rng.randint(0, 80)
+        batched.append(value, count)
+        for _ in range(count):
+            single.append(value)
+        for a, b in zip(batched.tiers, single.tiers):
+            assert list(a.lows.values()) == list(b.lows.values())
+            assert list(a.highs.values()) == list(b.highs.values())
+            assert (a.samples, a.low, a.high) == (b.samples, b.low, b.high)
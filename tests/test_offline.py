@@ -0,0 +1,51 @@
+import pickle
+from sim import World
+from sim.rules import BUILDABLES, ONE_SEC
+
+AWAY = 20*60*ONE_SEC
+
+
+def build_world(seed, wood):
+    world = World(cheats=True, seed=seed)
+    home = world.maps[4][4]
+    for name in ['house']*4 + ['wood generator']*2 + ['iron mine', 'gold mine']:
+        world.player.learn_building(name)
+        tile = next(tile for row in home.tiles for tile in row
+                    if tile is not None and tile.resource is None and tile.type in BUILDABLES[name]['canbuild'])
+        tile.begin_build(name)
+    world.advance(120*ONE_SEC)
+    for row in home.tiles:
+        for tile in row:
+            if tile is not None and tile.resource == 'house':
+                while tile.can_recruit():
+                    tile.recruit()
+    world.advance(10*ONE_SEC)
+    world.player.inventory['wood'] = wood
+    return world
+
+
+def compare(seed, wood):
+    exact = build_world(seed, wood)
+    fast = pickle.loads(pickle.dumps(exact))
+    before = dict(exact.player.inventory)
+    exact.advance(AWAY)
+    fast.catch_up(AWAY)
+    assert exact.now == fast.now
+    return {key: (exact.player.inventory[key] - before[key], fast.player.inventory[key] - before[key])
+            for key in ['ironore', 'goldore', 'wood', 'food']}
+
+
+def test_catch_up_well_stocked():
+    for seed in [3, 4]:
+        for key, (exact, fast) in compare(seed, 100000).items():
+            assert exact == fast, key
+
+
+def test_catch_up_generators_run_out():
+    # the generators run dry a few minutes in, and the mines relying on their power stop with them
+    for seed in [3, 4]:
+        gained = compare(seed, 88)
+        assert gained['wood'] == (-88, -88)
+        for key in ['ironore', 'goldore']:
+            exact, fast = gained[key]
+            assert abs(fast - exact) <= max(2, exact//20), (key, exact, fast)
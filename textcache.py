@@ -0,0 +1,28 @@
+from collections import OrderedDict
+
+
+class TextCache(object):
+    # rendered strings keyed on everything that changes their pixels, least recently
+    # used dropped first; the surfaces are shared, so they are only ever blitted from
+    def __init__(self, size=1024):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.__surfs = OrderedDict()
+
+    def __len__(self):
+        return len(self.__surfs)
+
+    def render(self, font, text, color, bg=None):
+        key = (font, text, tuple(color), None if bg is None else tuple(bg))
+        surf = self.__surfs.get(key)
+        if surf is None:
+            self.misses += 1
+            surf = font.render(text, True, color, bg)
+            self.__surfs[key] = surf
+            if len(self.__surfs) > self.size:
+                self.__surfs.popitem(last=False)
+        else:
+            self.hits += 1
+            self.__surfs.move_to_end(key)
+        return surf